@@ -7,7 +7,7 @@ import mysql.connector
 from mysql.connector import Error
 from config import get_config
 from cache import init_cache, CacheHelper, CACHE_TIMEOUTS
-import requests
+from audit import AuditBatcher
 
 # Load environment variables
 load_dotenv()
@@ -19,6 +19,9 @@ app = Flask(__name__)
 app.config['SECRET_KEY'] = app_config.SECRET_KEY
 app.config['TESTING'] = getattr(app_config, 'TESTING', False)
 app.config['WTF_CSRF_ENABLED'] = getattr(app_config, 'WTF_CSRF_ENABLED', True)
+app.config['TEMPLATES_AUTO_RELOAD'] = getattr(app_config, 'TEMPLATES_AUTO_RELOAD', None)
+app.config['EXPLAIN_TEMPLATE_LOADING'] = getattr(app_config, 'EXPLAIN_TEMPLATE_LOADING', False)
+app.config['PROPAGATE_EXCEPTIONS'] = getattr(app_config, 'PROPAGATE_EXCEPTIONS', None)
 
 # Database configuration from config module
 db_config = app_config.get_db_config()
@@ -29,6 +32,12 @@ cache_helper = CacheHelper(cache)
 
 # Cloud Function URL for audit logging
 FUNCTION_URL = app_config.FUNCTION_URL
+audit_batcher = AuditBatcher(
+    FUNCTION_URL,
+    app.logger,
+    batch_size=app_config.AUDIT_BATCH_SIZE,
+    flush_interval=app_config.AUDIT_FLUSH_INTERVAL
+)
 
 # Initialize login manager
 login_manager = LoginManager(app)
@@ -36,22 +45,18 @@ login_manager.login_view = 'login'
 
 
 def send_audit_log(event_type, username=None, details=None, request_obj=None):
-    """Send audit log to Cloud Function (non-blocking)."""
+    """Queue audit log for batched delivery to Cloud Function (non-blocking)."""
     if not FUNCTION_URL:
         return
 
-    try:
-        payload = {
-            'event_type': event_type,
-            'username': username,
-            'details': details or {},
-            'ip_address': request_obj.remote_addr if request_obj else None,
-            'user_agent': request_obj.headers.get('User-Agent') if request_obj else None
-        }
-        # Use a short timeout to not block the main request
-        requests.post(FUNCTION_URL, json=payload, timeout=1)
-    except Exception as e:
-        app.logger.warning(f"Failed to send audit log: {e}")
+    payload = {
+        'event_type': event_type,
+        'username': username,
+        'details': details or {},
+        'ip_address': request_obj.remote_addr if request_obj else None,
+        'user_agent': request_obj.headers.get('User-Agent') if request_obj else None
+    }
+    audit_batcher.enqueue(payload)
 
 def get_db_connection():
     try:
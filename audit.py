@@ -0,0 +1,137 @@
+"""
+Audit logging module for Chess Tournament Management System.
+Buffers audit events in memory and ships them to the Cloud Function in batches.
+"""
+
+import atexit
+import queue
+import threading
+import time
+
+import requests
+
+# Queued by close() to tell the sender thread to flush and exit
+_STOP = object()
+
+
+class AuditBatcher:
+    """Background sender that batches audit events to the Cloud Function.
+
+    Events are queued by the request thread and flushed by a daemon thread
+    whenever ``batch_size`` events are pending or ``flush_interval`` seconds
+    have passed since the first event of the batch was queued. Whatever is
+    still pending is sent by ``close()``, which runs at interpreter exit.
+    """
+
+    def __init__(self, function_url, logger, batch_size=100, flush_interval=2.0,
+                 max_attempts=4, retry_delay=0.5, shutdown_timeout=10.0):
+        self.function_url = function_url
+        self.logger = logger
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.shutdown_timeout = shutdown_timeout
+        self.enabled = bool(function_url)
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def enqueue(self, event):
+        """Queue an event for delivery (never blocks the caller)."""
+        if not self.enabled:
+            return
+        self._ensure_started()
+        self._queue.put(event)
+
+    def _ensure_started(self):
+        """Start the sender thread on first use."""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='audit-batcher', daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.close)
+
+    def close(self):
+        """Send everything still queued and stop the sender thread.
+
+        Waits up to ``shutdown_timeout`` seconds; events queued afterwards
+        are not sent.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self.enabled = False
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(self.shutdown_timeout)
+        if thread.is_alive():
+            self.logger.warning(
+                f"Audit sender still busy after {self.shutdown_timeout}s; "
+                f"abandoning {self._queue.qsize()} queued audit log(s)"
+            )
+
+    def _run(self):
+        """Drain the queue into batches until close() queues the stop marker."""
+        while True:
+            event = self._queue.get()
+            if event is _STOP:
+                return
+            batch = [event]
+            stopping = False
+            deadline = time.monotonic() + self.flush_interval
+            try:
+                while len(batch) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    event = self._queue.get(timeout=remaining)
+                    if event is _STOP:
+                        stopping = True
+                        break
+                    batch.append(event)
+            except queue.Empty:
+                pass
+            self._send(batch)
+            if stopping:
+                return
+
+    def _send(self, batch):
+        """POST one batch of events to the Cloud Function.
+
+        The function refuses a whole batch with 429 when its queue is full,
+        so the same batch is retried (after Retry-After, or a doubling
+        backoff) up to ``max_attempts`` times before it is dropped.
+        """
+        delay = self.retry_delay
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                resp = requests.post(self.function_url, json={'events': batch}, timeout=5)
+            except Exception as e:
+                self.logger.warning(f"Failed to send {len(batch)} audit log(s): {e}")
+                return
+
+            if resp.status_code != 429:
+                if resp.status_code >= 400:
+                    self.logger.warning(
+                        f"Audit function rejected {len(batch)} audit log(s): "
+                        f"HTTP {resp.status_code}"
+                    )
+                return
+
+            if attempt < self.max_attempts:
+                try:
+                    wait = float(resp.headers.get('Retry-After', delay))
+                except ValueError:
+                    wait = delay
+                time.sleep(wait)
+                delay *= 2
+
+        self.logger.warning(
+            f"Dropped {len(batch)} audit log(s): audit queue still full "
+            f"after {self.max_attempts} attempts"
+        )
@@ -5,6 +5,8 @@ Provides Redis-backed caching with fallback to simple in-memory cache.
 
 import os
 import json
+import types
+import hashlib
 import functools
 from datetime import datetime
 
@@ -16,29 +18,56 @@ except ImportError:
     CACHING_AVAILABLE = False
     Cache = None
 
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    redis = None
+
+# Environment settings, parsed once at import
+_REDIS_URL = os.getenv('REDIS_URL')
+_CACHE_TIMEOUT = int(os.getenv('CACHE_TIMEOUT', 300))
+_REDIS_POOL_SIZE = int(os.getenv('REDIS_POOL_SIZE', 32))
+
+# Shared Redis connection pool, created by init_cache when REDIS_URL is set
+_redis_pool = None
+
 
 def init_cache(app):
     """Initialize caching for the Flask app."""
+    global _redis_pool
+
     if not CACHING_AVAILABLE:
         app.logger.warning("Flask-Caching not installed. Caching disabled.")
         return None
 
-    redis_url = os.getenv('REDIS_URL')
+    redis_url = _REDIS_URL
 
     if redis_url:
         # Use Redis
         cache_config = {
             'CACHE_TYPE': 'redis',
-            'CACHE_REDIS_URL': redis_url,
-            'CACHE_DEFAULT_TIMEOUT': int(os.getenv('CACHE_TIMEOUT', 300)),
+            'CACHE_DEFAULT_TIMEOUT': _CACHE_TIMEOUT,
             'CACHE_KEY_PREFIX': 'chess_'
         }
+        if REDIS_AVAILABLE:
+            # One bounded, keep-alive pool per process instead of ad-hoc connections;
+            # Flask-Caching accepts a ready client in place of a host name
+            _redis_pool = redis.ConnectionPool.from_url(
+                redis_url,
+                max_connections=_REDIS_POOL_SIZE,
+                socket_keepalive=True
+            )
+            cache_config['CACHE_REDIS_HOST'] = redis.Redis(connection_pool=_redis_pool)
+        else:
+            cache_config['CACHE_REDIS_URL'] = redis_url
         app.logger.info(f"Caching enabled with Redis: {redis_url.split('@')[-1] if '@' in redis_url else redis_url}")
     else:
         # Use simple in-memory cache
         cache_config = {
             'CACHE_TYPE': 'simple',
-            'CACHE_DEFAULT_TIMEOUT': int(os.getenv('CACHE_TIMEOUT', 300)),
+            'CACHE_DEFAULT_TIMEOUT': _CACHE_TIMEOUT,
             'CACHE_THRESHOLD': 500
         }
         app.logger.info("Caching enabled with simple in-memory cache")
@@ -47,71 +76,123 @@ def init_cache(app):
     return cache
 
 
+# Argument types that are cheap to stringify and produce short, readable keys
+_SIMPLE_KEY_TYPES = (str, int, float, bool, type(None))
+
+
+def get_redis():
+    """Return a Redis client on the shared pool (None when Redis is not in use).
+
+    Use this for bulk operations that benefit from pipeline().
+    """
+    if _redis_pool is None:
+        return None
+    return redis.Redis(connection_pool=_redis_pool)
+
+
 def make_cache_key(*args, **kwargs):
-    """Create a cache key from function arguments."""
-    key_parts = [str(arg) for arg in args]
-    key_parts.extend(f"{k}={v}" for k, v in sorted(kwargs.items()))
-    return ':'.join(key_parts)
+    """Create a cache key from function arguments.
+
+    Simple scalar arguments produce a readable 'a:b:k=v' key. Anything else
+    (dicts, lists, rows) is hashed so large objects never end up in the key.
+    """
+    if all(isinstance(arg, _SIMPLE_KEY_TYPES) for arg in args) and \
+            all(isinstance(v, _SIMPLE_KEY_TYPES) for v in kwargs.values()):
+        key_parts = [str(arg) for arg in args]
+        key_parts.extend(f"{k}={v}" for k, v in sorted(kwargs.items()))
+        return ':'.join(key_parts)
+
+    payload = json.dumps([args, sorted(kwargs.items())], sort_keys=True,
+                         separators=(',', ':'), default=str)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _noop(*args, **kwargs):
+    """Stand-in for cache operations when caching is disabled."""
+    return None
+
+
+def _passthrough(f):
+    """Stand-in decorator when caching is disabled."""
+    return f
 
 
 class CacheHelper:
-    """Helper class for caching operations."""
+    """Helper class for caching operations.
+
+    get(key), set(key, value, timeout=None) and delete(key) are bound once at
+    construction: straight to the cache backend when enabled, or to no-ops
+    when caching is disabled, so no per-call enabled check is needed.
+    """
 
     def __init__(self, cache):
         self.cache = cache
         self.enabled = cache is not None
 
-    def get(self, key):
-        """Get value from cache."""
-        if not self.enabled:
-            return None
-        return self.cache.get(key)
+        if self.enabled:
+            self.get = cache.get
+            self.set = cache.set
+            self.delete = cache.delete
+        else:
+            self.get = self.set = self.delete = _noop
 
-    def set(self, key, value, timeout=None):
-        """Set value in cache."""
-        if not self.enabled:
-            return
-        self.cache.set(key, value, timeout=timeout)
-
-    def delete(self, key):
-        """Delete value from cache."""
-        if not self.enabled:
-            return
-        self.cache.delete(key)
+    def clear_pattern(self, pattern, batch_size=500):
+        """Clear all keys matching a glob pattern (Redis only).
 
-    def clear_pattern(self, pattern):
-        """Clear all keys matching pattern (Redis only)."""
+        Walks the keyspace with SCAN (non-blocking, unlike KEYS) and removes
+        matches in batches with UNLINK, falling back to DEL on Redis < 4.
+        Returns the number of keys removed.
+        """
         if not self.enabled:
-            return
-        if hasattr(self.cache, 'delete_memoized'):
-            # Flask-Caching doesn't support pattern deletion directly
-            # This would need custom Redis commands for pattern matching
-            pass
+            return 0
+
+        backend = getattr(self.cache, 'cache', None)
+        client = getattr(backend, '_write_client', None)
+        if client is None or not hasattr(client, 'scan_iter'):
+            # Not a Redis backend; pattern deletion is unsupported
+            return 0
+
+        match = f"{getattr(backend, 'key_prefix', '')}{pattern}"
+        removed = 0
+        batch = []
+        for key in client.scan_iter(match=match, count=batch_size):
+            batch.append(key)
+            if len(batch) >= batch_size:
+                removed += self._unlink(client, batch)
+                batch = []
+        if batch:
+            removed += self._unlink(client, batch)
+        return removed
+
+    @staticmethod
+    def _unlink(client, keys):
+        """Remove a batch of keys in one round-trip."""
+        try:
+            return client.unlink(*keys)
+        except redis.exceptions.ResponseError:
+            # UNLINK was added in Redis 4.0
+            return client.delete(*keys)
 
     def cached(self, timeout=None, key_prefix='view'):
         """Decorator for caching function results."""
         if not self.enabled:
-            def decorator(f):
-                return f
-            return decorator
+            return _passthrough
 
         return self.cache.cached(timeout=timeout, key_prefix=key_prefix)
 
     def memoize(self, timeout=None):
         """Decorator for memoizing function results with arguments."""
         if not self.enabled:
-            def decorator(f):
-                return f
-            return decorator
+            return _passthrough
 
         return self.cache.memoize(timeout=timeout)
 
 
-# Cache timeouts for different types of data
-CACHE_TIMEOUTS = {
+# Cache timeouts for different types of data (read-only)
+CACHE_TIMEOUTS = types.MappingProxyType({
     'statistics': 30,      # Player/arbiter statistics - 30 seconds
     'halls': 300,          # Hall information - 5 minutes
     'api_tables': 300,     # API table data - 5 minutes
     'admin_stats': 60,     # Admin stats page - 1 minute
     'dashboard': 15,       # Dashboard data - 15 seconds
-}
+})
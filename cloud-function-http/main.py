@@ -12,12 +12,25 @@ Events tracked:
 """
 
 import os
+import gzip
 import json
+import time
+import uuid
+import queue
+import functools
+import atexit
+import threading
 import functions_framework
 from datetime import datetime
 from google.cloud import storage
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, pooling
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Configuration
 AUDIT_BUCKET = os.getenv('AUDIT_BUCKET', 'chess-tournament-audit-logs')
@@ -26,43 +39,193 @@ DB_NAME = os.getenv('DB_NAME', 'chessdb')
 DB_USER = os.getenv('DB_USER')
 DB_PASSWORD = os.getenv('DB_PASSWORD')
 
-# Initialize Cloud Storage client
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 4))
+
+# Background write queue: events waiting for GCS/DB, and max events per write
+AUDIT_QUEUE_SIZE = int(os.getenv('AUDIT_QUEUE_SIZE', 10000))
+AUDIT_DRAIN_BATCH = int(os.getenv('AUDIT_DRAIN_BATCH', 500))
+
+# GCS is the record of every event: attempts per batch, and the first backoff
+GCS_WRITE_ATTEMPTS = 3
+GCS_RETRY_DELAY = 0.5
+
+# Maximum length of free-form string fields (details values, user agent)
+AUDIT_FIELD_LIMIT = int(os.getenv('AUDIT_FIELD_LIMIT', 2048))
+TRUNCATED_SUFFIX = '...[truncated]'
+
+# Width of audit_logs.user_agent; longer values would fail the whole batch
+# INSERT under strict SQL mode
+DB_USER_AGENT_LIMIT = 255
+
+# details dicts up to this many keys have their JSON encoding cached
+DETAILS_CACHE_MAX_KEYS = 8
+
+# Response headers, built once (tuples of pairs are accepted as response headers)
+CORS_HEADERS = (
+    ('Access-Control-Allow-Origin', '*'),
+    ('Content-Type', 'application/json'),
+)
+BUSY_HEADERS = CORS_HEADERS + (('Retry-After', '1'),)
+PREFLIGHT_HEADERS = (
+    ('Access-Control-Allow-Origin', '*'),
+    ('Access-Control-Allow-Methods', 'POST'),
+    ('Access-Control-Allow-Headers', 'Content-Type'),
+    ('Access-Control-Max-Age', '3600'),
+)
+
+# Initialize Cloud Storage client and resolve the bucket handle once per instance
+# (bucket() makes no API call; the client's HTTP session keeps connections alive)
 storage_client = storage.Client()
+audit_bucket = storage_client.bucket(AUDIT_BUCKET)
+
+# Connection pool, created on first use and kept for the lifetime of a warm instance
+_db_pool = None
+
+# Set once the audit_logs table has been created by this process
+_schema_ready = False
+
+
+def ensure_schema(conn):
+    """Create the audit_logs table once per process (cold start only)."""
+    global _schema_ready
+    if _schema_ready:
+        return
+
+    cursor = conn.cursor()
+    try:
+        # Silence the "table already exists" note on every cold start
+        cursor.execute("SET SESSION sql_notes = 0")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS audit_logs (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                event_type VARCHAR(50) NOT NULL,
+                username VARCHAR(50),
+                details TEXT,
+                ip_address VARCHAR(45),
+                user_agent VARCHAR(255),
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                INDEX idx_event_type (event_type),
+                INDEX idx_username (username),
+                INDEX idx_created_at (created_at)
+            )
+        """)
+        _schema_ready = True
+    finally:
+        # Pooled sessions aren't reset on checkout, so restore notes even if
+        # the CREATE failed
+        try:
+            cursor.execute("SET SESSION sql_notes = 1")
+        finally:
+            cursor.close()
+
+
+def dumps_json(obj):
+    """Serialize to compact JSON bytes, using orjson when it is installed.
+
+    orjson refuses some valid JSON (integers beyond 64 bits); those objects
+    fall back to the stdlib encoder so an event is never unserializable here.
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+@functools.lru_cache(maxsize=1024)
+def _encode_small_details(items):
+    """Encode a details dict given as ((key, type, value), ...) items."""
+    return dumps_json({key: value for key, _, value in items}).decode('utf-8')
+
+
+def encode_details(details):
+    """JSON-encode an event's details, reusing encodings of repeated small dicts.
+
+    Only small dicts of hashable values are cached; the value type is part of
+    the key so that e.g. True and 1 do not share an entry.
+    """
+    if isinstance(details, dict) and len(details) <= DETAILS_CACHE_MAX_KEYS:
+        try:
+            return _encode_small_details(
+                tuple((key, type(value), value) for key, value in details.items())
+            )
+        except TypeError:
+            pass  # Unhashable values (nested dicts/lists)
+    return dumps_json(details).decode('utf-8')
 
 
 def get_db_connection():
-    """Create database connection if configured."""
+    """Get a pooled database connection if configured."""
+    global _db_pool
     if not all([DB_HOST, DB_USER, DB_PASSWORD]):
         return None
     try:
-        connection = mysql.connector.connect(
-            host=DB_HOST,
-            database=DB_NAME,
-            user=DB_USER,
-            password=DB_PASSWORD
-        )
+        if _db_pool is None:
+            _db_pool = pooling.MySQLConnectionPool(
+                pool_name='audit',
+                pool_size=DB_POOL_SIZE,
+                pool_reset_session=False,
+                host=DB_HOST,
+                database=DB_NAME,
+                user=DB_USER,
+                password=DB_PASSWORD
+            )
+        connection = _db_pool.get_connection()
+        # Cloud SQL drops idle connections; revive stale ones before use
+        connection.ping(reconnect=True, attempts=2, delay=0)
+        try:
+            ensure_schema(connection)
+        except Error:
+            connection.close()
+            raise
         return connection
     except Error as e:
         print(f"Error connecting to MySQL: {e}")
         return None
 
 
-def store_in_gcs(event_data):
-    """Store audit event in Cloud Storage."""
-    try:
-        bucket = storage_client.bucket(AUDIT_BUCKET)
-
-        # Create path: year/month/day/timestamp_event.json
-        now = datetime.utcnow()
-        path = f"{now.year}/{now.month:02d}/{now.day:02d}/{now.isoformat()}_{event_data.get('event_type', 'unknown')}.json"
+def truncate_field(value, limit=AUDIT_FIELD_LIMIT):
+    """Truncate strings (recursively inside dicts/lists) to at most limit characters.
 
-        blob = bucket.blob(path)
+    The TRUNCATED_SUFFIX marker counts towards the limit.
+    """
+    if isinstance(value, str):
+        if len(value) > limit:
+            return value[:limit - len(TRUNCATED_SUFFIX)] + TRUNCATED_SUFFIX
+        return value
+    if isinstance(value, dict):
+        return {k: truncate_field(v, limit) for k, v in value.items()}
+    if isinstance(value, list):
+        return [truncate_field(v, limit) for v in value]
+    return value
+
+
+def store_in_gcs(events):
+    """Store a batch of audit events in Cloud Storage as a single NDJSON object."""
+    try:
+        # Create path: year/month/day/hhmmss_nanoseconds_uuid.ndjson (one object
+        # per batch); zero-padded fields keep keys in time order within a prefix
+        secs, nanos = divmod(time.time_ns(), 1_000_000_000)
+        year, month, day, hour, minute, second = time.gmtime(secs)[:6]
+        path = (f"{year}/{month:02d}/{day:02d}/"
+                f"{hour:02d}{minute:02d}{second:02d}_{nanos:09d}_{uuid.uuid4().hex[:8]}.ndjson")
+
+        # Compact, gzip-compressed NDJSON; GCS serves it decompressed on download
+        body = gzip.compress(b"\n".join(dumps_json(event) for event in events))
+
+        # Single multipart request: no checksum pass for non-critical audit data;
+        # if_generation_match=0 (create-only) makes transient failures safe to retry
+        blob = audit_bucket.blob(path)
+        blob.content_encoding = 'gzip'
         blob.upload_from_string(
-            json.dumps(event_data, indent=2),
-            content_type='application/json'
+            body,
+            content_type='application/x-ndjson',
+            checksum=None,
+            if_generation_match=0
         )
 
-        print(f"Stored audit log: gs://{AUDIT_BUCKET}/{path}")
+        print(f"Stored {len(events)} audit log(s): gs://{AUDIT_BUCKET}/{path}")
         return True
 
     except Exception as e:
@@ -70,8 +233,8 @@ def store_in_gcs(event_data):
         return False
 
 
-def store_in_db(event_data):
-    """Store audit event in database (optional)."""
+def store_in_db(events):
+    """Store a batch of audit events in database (optional)."""
     conn = get_db_connection()
     if not conn:
         return False
@@ -79,46 +242,128 @@ def store_in_db(event_data):
     try:
         cursor = conn.cursor()
 
-        # Create audit_logs table if it doesn't exist
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS audit_logs (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                event_type VARCHAR(50) NOT NULL,
-                username VARCHAR(50),
-                details TEXT,
-                ip_address VARCHAR(45),
-                user_agent VARCHAR(255),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                INDEX idx_event_type (event_type),
-                INDEX idx_username (username),
-                INDEX idx_created_at (created_at)
-            )
-        """)
+        # Gather the batch column by column, encoding details once per event
+        event_types = [e.get('event_type') for e in events]
+        usernames = [e.get('username') for e in events]
+        details = [encode_details(e.get('details', {})) for e in events]
+        ip_addresses = [e.get('ip_address') for e in events]
+        user_agents = [truncate_field(e.get('user_agent'), DB_USER_AGENT_LIMIT) for e in events]
 
-        # Insert audit log
-        cursor.execute("""
+        # executemany rewrites this into a single multi-row INSERT (one round-trip)
+        cursor.executemany("""
             INSERT INTO audit_logs (event_type, username, details, ip_address, user_agent)
             VALUES (%s, %s, %s, %s, %s)
-        """, (
-            event_data.get('event_type'),
-            event_data.get('username'),
-            json.dumps(event_data.get('details', {})),
-            event_data.get('ip_address'),
-            event_data.get('user_agent')
-        ))
+        """, list(zip(event_types, usernames, details, ip_addresses, user_agents)))
 
+        # Whole batch commits as one transaction
         conn.commit()
-        print(f"Stored audit log in database: {event_data.get('event_type')}")
+        print(f"Stored {len(events)} audit log(s) in database")
         return True
 
     except Error as e:
         print(f"Error storing to database: {e}")
+        # Don't hand a half-written transaction back to the pool
+        if conn.is_connected():
+            conn.rollback()
         return False
 
     finally:
         if conn.is_connected():
             cursor.close()
-            conn.close()
+        # Returns the connection to the pool
+        conn.close()
+
+
+def store_events(events):
+    """Store a batch of events in GCS (always) and the database (optional).
+
+    The events were acknowledged with 202 before this runs, so a failed GCS
+    write is retried with backoff; the create-only upload makes that safe.
+    """
+    gcs_success = store_in_gcs(events)
+    for attempt in range(1, GCS_WRITE_ATTEMPTS):
+        if gcs_success:
+            break
+        time.sleep(GCS_RETRY_DELAY * 2 ** (attempt - 1))
+        gcs_success = store_in_gcs(events)
+    if not gcs_success:
+        print(f"Dropped {len(events)} audit log(s) after {GCS_WRITE_ATTEMPTS} GCS attempts")
+    db_success = store_in_db(events)
+    return gcs_success, db_success
+
+
+def _admit(events):
+    """Queue a request's events all-or-nothing; False if they don't all fit.
+
+    Capacity is counted in events, so a batch is never split between queued
+    and refused (a client retrying a refused batch can't duplicate events).
+    """
+    global _queued_events
+    with _queued_lock:
+        if _queued_events + len(events) > AUDIT_QUEUE_SIZE:
+            return False
+        _queued_events += len(events)
+    for event in events:
+        _audit_queue.put_nowait(event)
+    return True
+
+
+def _take_batch(first=None):
+    """Collect up to AUDIT_DRAIN_BATCH queued events without blocking."""
+    global _queued_events
+    batch = [] if first is None else [first]
+    while len(batch) < AUDIT_DRAIN_BATCH:
+        try:
+            batch.append(_audit_queue.get_nowait())
+        except queue.Empty:
+            break
+    with _queued_lock:
+        _queued_events -= len(batch)
+    return batch
+
+
+def _drain():
+    """Background worker: write queued events in batches."""
+    while True:
+        batch = _take_batch(_audit_queue.get())
+        try:
+            store_events(batch)
+        except Exception as e:
+            print(f"Error writing audit batch: {e}")
+
+
+def _flush_pending():
+    """Write whatever is still queued when the instance shuts down."""
+    batch = _take_batch()
+    while batch:
+        store_events(batch)
+        batch = _take_batch()
+
+
+# Unbounded queue; _admit enforces AUDIT_QUEUE_SIZE over whole requests.
+# The drain thread runs outside requests, so the service is deployed with
+# always-allocated CPU (see DEPLOYMENT.md)
+_audit_queue = queue.Queue()
+_queued_events = 0
+_queued_lock = threading.Lock()
+threading.Thread(target=_drain, name='audit-drain', daemon=True).start()
+atexit.register(_flush_pending)
+
+
+def build_event(raw_event, request, timestamp):
+    """Validate a raw event and add request metadata. Returns None if invalid."""
+    if not isinstance(raw_event, dict) or not raw_event.get('event_type'):
+        return None
+
+    return {
+        'event_type': raw_event['event_type'],
+        'username': raw_event.get('username'),
+        'details': truncate_field(raw_event.get('details', {})),
+        'ip_address': raw_event.get('ip_address') or request.remote_addr,
+        'user_agent': truncate_field(raw_event.get('user_agent') or request.headers.get('User-Agent')),
+        'timestamp': timestamp,
+        'source': 'chess-tournament-app'
+    }
 
 
 @functions_framework.http
@@ -126,7 +371,7 @@ def audit_log(request):
     """
     HTTP Cloud Function for audit logging.
 
-    Expected JSON payload:
+    Expected JSON payload is either a single event:
     {
         "event_type": "login|logout|match_created|match_rated|user_created",
         "username": "user123",
@@ -134,23 +379,26 @@ def audit_log(request):
         "ip_address": "1.2.3.4",
         "user_agent": "Mozilla/5.0..."
     }
+
+    or a batch of events: {"events": [{...}, {...}]} (a bare JSON array
+    is accepted as well).
+
+    Events are queued and written by a background thread in batches of up
+    to AUDIT_DRAIN_BATCH (one GCS object and one multi-row INSERT each), so
+    the response only confirms that events were accepted. Returns 429 (with
+    Retry-After) when the queue can't take the whole request, in which case
+    none of its events were queued; 413 if the request alone exceeds the queue.
     """
     # Handle CORS preflight
     if request.method == 'OPTIONS':
-        headers = {
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Methods': 'POST',
-            'Access-Control-Allow-Headers': 'Content-Type',
-            'Access-Control-Max-Age': '3600'
-        }
-        return ('', 204, headers)
+        return ('', 204, PREFLIGHT_HEADERS)
 
-    # Set CORS headers for actual request
-    headers = {'Access-Control-Allow-Origin': '*'}
+    # CORS headers for actual request
+    headers = CORS_HEADERS
 
     # Validate request
     if request.method != 'POST':
-        return (json.dumps({'error': 'Method not allowed'}), 405, headers)
+        return (dumps_json({'error': 'Method not allowed'}), 405, headers)
 
     try:
         request_json = request.get_json(silent=True)
@@ -158,40 +406,45 @@ def audit_log(request):
         request_json = None
 
     if not request_json:
-        return (json.dumps({'error': 'Invalid JSON payload'}), 400, headers)
-
-    # Validate required fields
-    event_type = request_json.get('event_type')
-    if not event_type:
-        return (json.dumps({'error': 'event_type is required'}), 400, headers)
-
-    # Add metadata
-    event_data = {
-        'event_type': event_type,
-        'username': request_json.get('username'),
-        'details': request_json.get('details', {}),
-        'ip_address': request_json.get('ip_address') or request.remote_addr,
-        'user_agent': request_json.get('user_agent') or request.headers.get('User-Agent'),
-        'timestamp': datetime.utcnow().isoformat(),
-        'source': 'chess-tournament-app'
-    }
-
-    # Store in GCS (always)
-    gcs_success = store_in_gcs(event_data)
-
-    # Store in DB (optional)
-    db_success = store_in_db(event_data)
+        return (dumps_json({'error': 'Invalid JSON payload'}), 400, headers)
+
+    # Normalize to a list of raw events
+    if isinstance(request_json, list):
+        raw_events = request_json
+    elif isinstance(request_json, dict) and 'events' in request_json:
+        raw_events = request_json['events']
+    else:
+        raw_events = [request_json]
+
+    if not isinstance(raw_events, list) or not raw_events:
+        return (dumps_json({'error': 'events must be a non-empty list'}), 400, headers)
+
+    # Validate required fields and add metadata (one timestamp per request)
+    timestamp = datetime.utcnow().isoformat()
+    events = [build_event(raw_event, request, timestamp) for raw_event in raw_events]
+    if any(event is None for event in events):
+        return (dumps_json({'error': 'event_type is required'}), 400, headers)
+
+    # Hand off to the background writer; apply back-pressure when full
+    if len(events) > AUDIT_QUEUE_SIZE:
+        return (dumps_json({
+            'error': f'At most {AUDIT_QUEUE_SIZE} events per request'
+        }), 413, headers)
+    if not _admit(events):
+        return (dumps_json({
+            'error': 'Audit queue full, retry later',
+            'accepted': 0
+        }), 429, BUSY_HEADERS)
 
     # Response
     result = {
-        'status': 'success' if gcs_success else 'partial',
-        'event_type': event_type,
-        'timestamp': event_data['timestamp'],
-        'stored_in_gcs': gcs_success,
-        'stored_in_db': db_success
+        'status': 'queued',
+        'event_count': len(events),
+        'event_type': events[0]['event_type'],
+        'timestamp': timestamp
     }
 
-    return (json.dumps(result), 200, headers)
+    return (dumps_json(result), 202, headers)
 
 
 # For local testing
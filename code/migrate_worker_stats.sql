@@ -0,0 +1,83 @@
+-- ============================================================================
+-- Stats worker migration for databases created before these keys and indexes
+-- were part of schema.sql / triggers.sql. Safe to re-run.
+--
+--   mysql -h 127.0.0.1 -u chessapp -p chessdb < code/migrate_worker_stats.sql
+--
+-- Run it with a user that has ALTER; the worker itself only needs SELECT,
+-- INSERT, UPDATE and DELETE, and falls back to slower queries until this
+-- has been applied.
+-- ============================================================================
+
+DELIMITER $$
+
+-- Run ddl unless tbl already has an index named idx
+DROP PROCEDURE IF EXISTS migrateAddIndex$$
+CREATE PROCEDURE migrateAddIndex(IN tbl VARCHAR(64), IN idx VARCHAR(64), IN ddl TEXT)
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+          FROM information_schema.statistics
+         WHERE table_schema = DATABASE()
+           AND table_name = tbl
+           AND index_name = idx
+    ) THEN
+        SET @migrate_ddl = ddl;
+        PREPARE stmt FROM @migrate_ddl;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+    END IF;
+END$$
+
+-- Run ddl unless tbl already has a column named col
+DROP PROCEDURE IF EXISTS migrateAddColumn$$
+CREATE PROCEDURE migrateAddColumn(IN tbl VARCHAR(64), IN col VARCHAR(64), IN ddl TEXT)
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+          FROM information_schema.columns
+         WHERE table_schema = DATABASE()
+           AND table_name = tbl
+           AND column_name = col
+    ) THEN
+        SET @migrate_ddl = ddl;
+        PREPARE stmt FROM @migrate_ddl;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+    END IF;
+END$$
+
+DELIMITER ;
+
+-- ----------------------------------------------------------------------------
+-- system_stats: unique stat_name, required by the worker's batched upsert
+-- ----------------------------------------------------------------------------
+
+-- The old worker's DELETE + INSERT wasn't atomic and could leave several rows
+-- per stat; keep the newest of each before adding the key
+DELETE older
+  FROM system_stats older
+  JOIN system_stats newer
+    ON newer.stat_name = older.stat_name
+   AND newer.stat_id > older.stat_id;
+
+CALL migrateAddIndex('system_stats', 'uq_stat_name',
+    'ALTER TABLE system_stats ADD UNIQUE KEY uq_stat_name (stat_name)');
+
+-- ----------------------------------------------------------------------------
+-- Grouping indexes: matches_per_month and avg_elo_by_nationality stream
+-- their groups in index order instead of building temp tables
+-- ----------------------------------------------------------------------------
+
+-- Virtual, so adding it doesn't rebuild the table
+CALL migrateAddColumn('matches', 'match_month',
+    'ALTER TABLE matches ADD COLUMN match_month INT AS (YEAR(date) * 100 + MONTH(date)) VIRTUAL');
+
+CALL migrateAddIndex('matches', 'idx_matches_month',
+    'ALTER TABLE matches ADD INDEX idx_matches_month (match_month)');
+
+CALL migrateAddIndex('players', 'idx_players_nat_elo',
+    'ALTER TABLE players ADD INDEX idx_players_nat_elo (nationality, elorating)');
+
+DROP PROCEDURE migrateAddIndex;
+DROP PROCEDURE migrateAddColumn;
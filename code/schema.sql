@@ -73,6 +73,7 @@ create table players (
     titleid      int         not null,
     team_list    varchar(50) not null,
     primary key (username),
+    index idx_players_nat_elo (nationality, elorating),
     foreign key (username) references users(username) on delete cascade,
     foreign key (titleid) references title(title_id),
     check (elorating > 1000)
@@ -167,7 +168,11 @@ create table matches (
     team2_id         int          not null,
     arbiter_username varchar(50)  not null,
     ratings          int          null,
+    match_month      int          as (year(date) * 100 + month(date)) virtual,
     primary key (match_id),
+    index idx_matches_month (match_month),
+    index idx_matches_team1 (team1_id),
+    index idx_matches_team2 (team2_id),
     foreign key (hall_id)
         references halls(hall_id)
         on delete cascade
@@ -8,7 +8,7 @@ CREATE TABLE IF NOT EXISTS system_stats (
     stat_value TEXT NOT NULL,
     stat_category VARCHAR(50) DEFAULT 'general',
     computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    INDEX idx_stat_name (stat_name),
+    UNIQUE KEY uq_stat_name (stat_name),
     INDEX idx_category (stat_category),
     INDEX idx_computed_at (computed_at)
 ) ENGINE=InnoDB;
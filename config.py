@@ -3,6 +3,7 @@ Configuration module for Chess Tournament Management System.
 Supports environment-based configuration for local dev, testing, and production (GCP).
 """
 import os
+from functools import lru_cache
 
 # Load dotenv if available (optional for production)
 try:
@@ -27,6 +28,8 @@ class Config:
 
     # Cloud Function URL (for audit logging)
     FUNCTION_URL = os.getenv('FUNCTION_URL', None)
+    AUDIT_BATCH_SIZE = int(os.getenv('AUDIT_BATCH_SIZE', 100))
+    AUDIT_FLUSH_INTERVAL = float(os.getenv('AUDIT_FLUSH_INTERVAL', 2.0))
 
     # Redis/Caching
     REDIS_URL = os.getenv('REDIS_URL', None)
@@ -34,8 +37,12 @@ class Config:
     CACHE_DEFAULT_TIMEOUT = int(os.getenv('CACHE_TIMEOUT', 300))
 
     @classmethod
+    @lru_cache(maxsize=None)
     def get_db_config(cls):
-        """Return database configuration dictionary for mysql.connector."""
+        """Return database configuration dictionary for mysql.connector.
+
+        Built once per config class; callers share the dict and must not mutate it.
+        """
         return {
             'host': cls.DB_HOST,
             'port': cls.DB_PORT,
@@ -60,6 +67,10 @@ class TestingConfig(Config):
     SECRET_KEY = 'test-secret-key'
     # Disable CSRF for testing
     WTF_CSRF_ENABLED = False
+    # Templates don't change mid-run: skip the per-render mtime check
+    TEMPLATES_AUTO_RELOAD = False
+    EXPLAIN_TEMPLATE_LOADING = False
+    PROPAGATE_EXCEPTIONS = True
 
 
 class ProductionConfig(Config):
@@ -85,7 +96,8 @@ config = {
 }
 
 
+@lru_cache(maxsize=1)
 def get_config():
-    """Get configuration based on FLASK_ENV environment variable."""
+    """Get configuration based on FLASK_ENV environment variable (resolved once)."""
     env = os.getenv('FLASK_ENV', 'development')
     return config.get(env, config['default'])
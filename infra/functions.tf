@@ -89,7 +89,9 @@ resource "google_cloudfunctions2_function" "audit_logger" {
 
   service_config {
     max_instance_count    = 10
-    min_instance_count    = 0
+    # Keep one instance (and its audit queue) around between bursts; CPU must
+    # also be always allocated, which this resource can't set - see DEPLOYMENT.md
+    min_instance_count    = 1
     available_memory      = "256M"
     timeout_seconds       = 60
     service_account_email = google_service_account.functions.email
@@ -10,17 +10,196 @@ This script analyzes load test results and generates:
 
 Usage:
     python analyze_results.py
-    python analyze_results.py --results test_results/performance_results_*.json
+    python analyze_results.py --results test_results/performance_results_*.json.gz
     python analyze_results.py --compare test1.json test2.json
 """
 
 import json
 import glob
+import gzip
+import mmap
+import heapq
+import functools
 import argparse
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-import statistics
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Row template for print_test_summary_table
+SUMMARY_ROW_FORMAT = "{name:<30} {requests:<12,} {rps:<10.2f} {p95:<12.2f} {fail:<10.2f}\n"
+
+
+def top_endpoints(endpoints, k=5):
+    """Return (slowest, most_requested) top-k endpoint lists in one pass.
+
+    Each list holds (name, stats) pairs in descending order, ties kept in
+    input order. Two size-k min-heaps are maintained side by side, keyed on
+    (metric, -position) so the later of two equal entries is evicted first.
+    """
+    slowest = []
+    busiest = []
+    for position, (name, ep_stats) in enumerate(endpoints.items()):
+        slow_item = (ep_stats['avg_response_time'], -position, name)
+        busy_item = (ep_stats['num_requests'], -position, name)
+        if len(slowest) < k:
+            heapq.heappush(slowest, slow_item)
+            heapq.heappush(busiest, busy_item)
+        else:
+            heapq.heappushpop(slowest, slow_item)
+            heapq.heappushpop(busiest, busy_item)
+
+    return (
+        [(name, endpoints[name]) for _, _, name in sorted(slowest, reverse=True)],
+        [(name, endpoints[name]) for _, _, name in sorted(busiest, reverse=True)],
+    )
+
+
+def result_name(file_path):
+    """File name without its '.json' / '.json.gz' extension."""
+    path = Path(file_path)
+    if path.suffix == '.gz':
+        path = path.with_suffix('')
+    return path.stem
+
+
+def _star_match(name, prefix, middle, suffix):
+    """Match name against a glob made only of literals and '*' wildcards."""
+    if len(name) < len(prefix) + len(suffix) or not (
+            name.startswith(prefix) and name.endswith(suffix)):
+        return False
+    pos, end = len(prefix), len(name) - len(suffix)
+    # Leftmost matches of each literal, in order, are enough for '*'-only globs
+    for part in middle:
+        pos = name.find(part, pos, end)
+        if pos < 0:
+            return False
+        pos += len(part)
+    return True
+
+
+def find_files(pattern):
+    """Return sorted paths matching a glob pattern.
+
+    Patterns whose wildcards are all '*' in the file name (the defaults, such
+    as 'dir/prefix*.json*') are matched with a single os.scandir pass;
+    anything else falls back to glob.
+    """
+    directory, name = os.path.split(pattern)
+    if '*' not in name or any(c in directory for c in '*?[') or any(c in name for c in '?['):
+        return sorted(glob.glob(pattern))
+
+    prefix, *middle, suffix = name.split('*')
+    middle = [part for part in middle if part]
+    try:
+        with os.scandir(directory or '.') as entries:
+            paths = [
+                os.path.join(directory, entry.name) for entry in entries
+                if _star_match(entry.name, prefix, middle, suffix)
+                and not (entry.name.startswith('.') and not prefix.startswith('.'))
+                and entry.is_file()
+            ]
+    except FileNotFoundError:
+        return []
+    return sorted(paths)
+
+
+def load_json_file(file_path):
+    """Read and decode a JSON file, using orjson when it is installed.
+
+    Plain files are memory-mapped so orjson can parse them without an extra
+    copy; '.gz' files are decompressed first.
+    """
+    if file_path.endswith('.gz'):
+        with gzip.open(file_path, 'rb') as f:
+            raw = f.read()
+        return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+    with open(file_path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if ORJSON_AVAILABLE:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+            return json.loads(mm[:])
+
+
+@functools.lru_cache(maxsize=256)
+def assess_metrics(failure_rate, p95, p99, requests_per_second):
+    """Build the performance assessment lines for a set of headline metrics.
+
+    Pure function of its inputs, so repeated results (e.g. the same file in
+    several runs of a comparison) reuse the already-built lines.
+    """
+    lines = []
+    issues = []
+    recommendations = []
+
+    # Check failure rate
+    if failure_rate > 0.05:  # > 5%
+        issues.append(f"⚠ High failure rate: {failure_rate*100:.2f}%")
+        recommendations.append("Investigate error logs and increase server capacity")
+    elif failure_rate > 0.01:  # > 1%
+        issues.append(f"⚠ Moderate failure rate: {failure_rate*100:.2f}%")
+    else:
+        lines.append(f"  ✓ Excellent failure rate: {failure_rate*100:.2f}%")
+
+    # Check response times
+    if p95 > 2000:  # > 2 seconds
+        issues.append(f"⚠ High p95 response time: {p95:.2f} ms")
+        recommendations.append("Optimize slow endpoints or add caching")
+    elif p95 > 1000:  # > 1 second
+        issues.append(f"⚠ Moderate p95 response time: {p95:.2f} ms")
+    else:
+        lines.append(f"  ✓ Good p95 response time: {p95:.2f} ms")
+
+    # Check p99
+    if p99 > 5000:  # > 5 seconds
+        issues.append(f"⚠ Very high p99 response time: {p99:.2f} ms")
+        recommendations.append("Investigate outliers and database query performance")
+    elif p99 > 3000:  # > 3 seconds
+        issues.append(f"⚠ High p99 response time: {p99:.2f} ms")
+
+    # Check throughput
+    if requests_per_second < 10:
+        issues.append(f"⚠ Low throughput: {requests_per_second:.2f} req/s")
+        recommendations.append("Consider horizontal scaling or performance optimization")
+    else:
+        lines.append(f"  ✓ Throughput: {requests_per_second:.2f} req/s")
+
+    # Issues and recommendations
+    if issues:
+        lines.append("\n  Issues Identified:")
+        for issue in issues:
+            lines.append(f"    {issue}")
+
+    if recommendations:
+        lines.append("\n  Recommendations:")
+        for rec in recommendations:
+            lines.append(f"    • {rec}")
+
+    return tuple(lines)
+
+
+def _load_and_format(file_path):
+    """Worker entry point: load one result file and build its report.
+
+    Returns (data, report), or (None, error message) if the file is unreadable.
+    """
+    try:
+        data = load_json_file(file_path)
+        data['_file'] = file_path
+        return data, PerformanceAnalyzer().format_single_test(data)
+    except Exception as e:
+        return None, str(e)
 
 
 class PerformanceAnalyzer:
@@ -30,157 +209,151 @@ class PerformanceAnalyzer:
         self.results = []
         self.resource_data = []
 
-    def load_results(self, pattern='test_results/performance_results_*.json'):
+    def load_results(self, pattern='test_results/performance_results_*.json*'):
         """Load all performance result files matching pattern."""
-        files = glob.glob(pattern)
+        files = find_files(pattern)
 
         if not files:
             print(f"No result files found matching: {pattern}")
             return
 
-        for file_path in sorted(files):
+        for file_path in files:
             try:
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                    data['_file'] = file_path
-                    self.results.append(data)
+                data = load_json_file(file_path)
+                data['_file'] = file_path
+                self.results.append(data)
                 print(f"Loaded: {file_path}")
             except Exception as e:
                 print(f"Error loading {file_path}: {e}")
 
         print(f"\nLoaded {len(self.results)} result file(s)")
 
-    def load_resource_data(self, pattern='test_results/resources_*.json'):
+    def load_and_analyze(self, pattern='test_results/performance_results_*.json*', workers=None):
+        """Load and analyze result files in parallel, printing reports in file order.
+
+        Each file is decoded and formatted in a worker process; the parent only
+        collects the parsed results (for the summary outputs) and the reports.
+        """
+        files = find_files(pattern)
+
+        if not files:
+            print(f"No result files found matching: {pattern}")
+            return
+
+        executor = None
+        if len(files) == 1 or workers == 1:
+            outputs = map(_load_and_format, files)
+        else:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            outputs = executor.map(_load_and_format, files)
+
+        reports = []
+        try:
+            for file_path, (data, report) in zip(files, outputs):
+                if data is None:
+                    print(f"Error loading {file_path}: {report}")
+                    continue
+                self.results.append(data)
+                reports.append(report)
+                print(f"Loaded: {file_path}")
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        print(f"\nLoaded {len(self.results)} result file(s)")
+
+        for report in reports:
+            print(report)
+
+    def load_resource_data(self, pattern='test_results/resources_*.json*'):
         """Load resource monitoring data."""
-        files = glob.glob(pattern)
+        files = find_files(pattern)
 
-        for file_path in sorted(files):
+        for file_path in files:
             try:
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                    data['_file'] = file_path
-                    self.resource_data.append(data)
+                data = load_json_file(file_path)
+                data['_file'] = file_path
+                self.resource_data.append(data)
                 print(f"Loaded resource data: {file_path}")
             except Exception as e:
                 print(f"Error loading {file_path}: {e}")
 
     def analyze_single_test(self, result):
         """Analyze a single test result."""
-        print("\n" + "="*80)
-        print(f"ANALYSIS: {result['_file']}")
-        print("="*80)
+        print(self.format_single_test(result))
+
+    def format_single_test(self, result):
+        """Build the analysis report for a single test result as a string."""
+        lines = []
+        out = lines.append
+
+        out("\n" + "="*80)
+        out(f"ANALYSIS: {result['_file']}")
+        out("="*80)
 
         info = result['test_info']
         stats = result['overall_stats']
         percentiles = result['percentiles']
 
-        print(f"\nTest Information:")
-        print(f"  Start Time: {info['start_time']}")
-        print(f"  Duration: {info['duration_seconds']:.2f} seconds")
-        print(f"  Target Host: {info['host']}")
-
-        print(f"\nOverall Performance:")
-        print(f"  Total Requests: {stats['total_requests']:,}")
-        print(f"  Total Failures: {stats['total_failures']:,}")
-        print(f"  Failure Rate: {stats['failure_rate']*100:.2f}%")
-        print(f"  Throughput: {stats['requests_per_second']:.2f} req/s")
-
-        print(f"\nResponse Time Statistics:")
-        print(f"  Average: {stats['average_response_time']:.2f} ms")
-        print(f"  Minimum: {stats['min_response_time']:.2f} ms")
-        print(f"  Maximum: {stats['max_response_time']:.2f} ms")
-        print(f"  Median (p50): {percentiles['p50']:.2f} ms")
-        print(f"  p95: {percentiles['p95']:.2f} ms")
-        print(f"  p99: {percentiles['p99']:.2f} ms")
+        out(f"\nTest Information:")
+        out(f"  Start Time: {info['start_time']}")
+        out(f"  Duration: {info['duration_seconds']:.2f} seconds")
+        out(f"  Target Host: {info['host']}")
+
+        out(f"\nOverall Performance:")
+        out(f"  Total Requests: {stats['total_requests']:,}")
+        out(f"  Total Failures: {stats['total_failures']:,}")
+        out(f"  Failure Rate: {stats['failure_rate']*100:.2f}%")
+        out(f"  Throughput: {stats['requests_per_second']:.2f} req/s")
+
+        out(f"\nResponse Time Statistics:")
+        out(f"  Average: {stats['average_response_time']:.2f} ms")
+        out(f"  Minimum: {stats['min_response_time']:.2f} ms")
+        out(f"  Maximum: {stats['max_response_time']:.2f} ms")
+        out(f"  Median (p50): {percentiles['p50']:.2f} ms")
+        out(f"  p95: {percentiles['p95']:.2f} ms")
+        out(f"  p99: {percentiles['p99']:.2f} ms")
 
         # Performance assessment
-        print(f"\nPerformance Assessment:")
-        self._assess_performance(stats, percentiles)
+        out(f"\nPerformance Assessment:")
+        lines.extend(self._assess_performance(stats, percentiles))
 
         # Endpoint analysis
-        print(f"\nTop 5 Slowest Endpoints:")
+        out(f"\nTop 5 Slowest Endpoints:")
         endpoints = result.get('endpoint_details', {})
-        sorted_endpoints = sorted(
-            endpoints.items(),
-            key=lambda x: x[1]['avg_response_time'],
-            reverse=True
-        )[:5]
+        sorted_endpoints, sorted_by_requests = top_endpoints(endpoints, 5)
 
         for i, (name, ep_stats) in enumerate(sorted_endpoints, 1):
-            print(f"  {i}. {name}")
-            print(f"     Avg: {ep_stats['avg_response_time']:.2f} ms | "
-                  f"p95: {ep_stats['percentiles']['p95']:.2f} ms | "
-                  f"Requests: {ep_stats['num_requests']:,} | "
-                  f"Failures: {ep_stats['num_failures']:,}")
+            out(f"  {i}. {name}")
+            out(f"     Avg: {ep_stats['avg_response_time']:.2f} ms | "
+                f"p95: {ep_stats['percentiles']['p95']:.2f} ms | "
+                f"Requests: {ep_stats['num_requests']:,} | "
+                f"Failures: {ep_stats['num_failures']:,}")
 
         # Most requested endpoints
-        print(f"\nTop 5 Most Requested Endpoints:")
-        sorted_by_requests = sorted(
-            endpoints.items(),
-            key=lambda x: x[1]['num_requests'],
-            reverse=True
-        )[:5]
+        out(f"\nTop 5 Most Requested Endpoints:")
 
         for i, (name, ep_stats) in enumerate(sorted_by_requests, 1):
-            print(f"  {i}. {name}")
-            print(f"     Requests: {ep_stats['num_requests']:,} | "
-                  f"RPS: {ep_stats['requests_per_second']:.2f} | "
-                  f"Avg RT: {ep_stats['avg_response_time']:.2f} ms")
+            out(f"  {i}. {name}")
+            out(f"     Requests: {ep_stats['num_requests']:,} | "
+                f"RPS: {ep_stats['requests_per_second']:.2f} | "
+                f"Avg RT: {ep_stats['avg_response_time']:.2f} ms")
 
-    def _assess_performance(self, stats, percentiles):
-        """Provide performance assessment based on metrics."""
-        issues = []
-        recommendations = []
-
-        # Check failure rate
-        if stats['failure_rate'] > 0.05:  # > 5%
-            issues.append(f"⚠ High failure rate: {stats['failure_rate']*100:.2f}%")
-            recommendations.append("Investigate error logs and increase server capacity")
-        elif stats['failure_rate'] > 0.01:  # > 1%
-            issues.append(f"⚠ Moderate failure rate: {stats['failure_rate']*100:.2f}%")
-        else:
-            print(f"  ✓ Excellent failure rate: {stats['failure_rate']*100:.2f}%")
-
-        # Check response times
-        if percentiles['p95'] > 2000:  # > 2 seconds
-            issues.append(f"⚠ High p95 response time: {percentiles['p95']:.2f} ms")
-            recommendations.append("Optimize slow endpoints or add caching")
-        elif percentiles['p95'] > 1000:  # > 1 second
-            issues.append(f"⚠ Moderate p95 response time: {percentiles['p95']:.2f} ms")
-        else:
-            print(f"  ✓ Good p95 response time: {percentiles['p95']:.2f} ms")
-
-        # Check p99
-        if percentiles['p99'] > 5000:  # > 5 seconds
-            issues.append(f"⚠ Very high p99 response time: {percentiles['p99']:.2f} ms")
-            recommendations.append("Investigate outliers and database query performance")
-        elif percentiles['p99'] > 3000:  # > 3 seconds
-            issues.append(f"⚠ High p99 response time: {percentiles['p99']:.2f} ms")
-
-        # Check throughput
-        if stats['requests_per_second'] < 10:
-            issues.append(f"⚠ Low throughput: {stats['requests_per_second']:.2f} req/s")
-            recommendations.append("Consider horizontal scaling or performance optimization")
-        else:
-            print(f"  ✓ Throughput: {stats['requests_per_second']:.2f} req/s")
-
-        # Print issues and recommendations
-        if issues:
-            print("\n  Issues Identified:")
-            for issue in issues:
-                print(f"    {issue}")
+        return "\n".join(lines)
 
-        if recommendations:
-            print("\n  Recommendations:")
-            for rec in recommendations:
-                print(f"    • {rec}")
+    def _assess_performance(self, stats, percentiles):
+        """Provide performance assessment based on metrics, as report lines."""
+        return list(assess_metrics(
+            stats['failure_rate'],
+            percentiles['p95'],
+            percentiles['p99'],
+            stats['requests_per_second']
+        ))
 
     def compare_tests(self, file1, file2):
         """Compare two test results."""
-        with open(file1, 'r') as f:
-            result1 = json.load(f)
-        with open(file2, 'r') as f:
-            result2 = json.load(f)
+        result1 = load_json_file(file1)
+        result2 = load_json_file(file2)
 
         print("\n" + "="*80)
         print("TEST COMPARISON")
@@ -229,8 +402,7 @@ class PerformanceAnalyzer:
 
     def analyze_resources(self, resource_file):
         """Analyze resource monitoring data."""
-        with open(resource_file, 'r') as f:
-            data = json.load(f)
+        data = load_json_file(resource_file)
 
         print("\n" + "="*80)
         print(f"RESOURCE USAGE ANALYSIS: {resource_file}")
@@ -319,21 +491,31 @@ class PerformanceAnalyzer:
 
         # Aggregate metrics
         if self.results:
-            all_throughput = [r['overall_stats']['requests_per_second'] for r in self.results]
-            all_p95 = [r['percentiles']['p95'] for r in self.results]
-            all_failures = [r['overall_stats']['failure_rate'] for r in self.results]
+            count = len(self.results)
+            all_throughput = np.fromiter(
+                (r['overall_stats']['requests_per_second'] for r in self.results),
+                dtype=np.float64, count=count)
+            all_p95 = np.fromiter(
+                (r['percentiles']['p95'] for r in self.results),
+                dtype=np.float64, count=count)
+            all_failures = np.fromiter(
+                (r['overall_stats']['failure_rate'] for r in self.results),
+                dtype=np.float64, count=count)
+            all_requests = np.fromiter(
+                (r['overall_stats']['total_requests'] for r in self.results),
+                dtype=np.int64, count=count)
 
             slide_data['key_metrics'] = {
-                'avg_throughput': statistics.mean(all_throughput),
-                'max_throughput': max(all_throughput),
-                'avg_p95': statistics.mean(all_p95),
-                'avg_failure_rate': statistics.mean(all_failures),
-                'total_requests': sum(r['overall_stats']['total_requests'] for r in self.results)
+                'avg_throughput': float(all_throughput.mean()),
+                'max_throughput': float(all_throughput.max()),
+                'avg_p95': float(all_p95.mean()),
+                'avg_failure_rate': float(all_failures.mean()),
+                'total_requests': int(all_requests.sum())
             }
 
             # Per-test summary
             for result in self.results:
-                test_name = Path(result['_file']).stem
+                test_name = result_name(result['_file'])
                 slide_data['test_summary'].append({
                     'name': test_name,
                     'throughput': result['overall_stats']['requests_per_second'],
@@ -362,29 +544,34 @@ class PerformanceAnalyzer:
         print(f"{'Test':<30} {'Requests':<12} {'RPS':<10} {'p95 (ms)':<12} {'Fail %':<10}")
         print("-" * 80)
 
-        for result in self.results:
-            test_name = Path(result['_file']).stem.replace('performance_results_', '')
-            stats = result['overall_stats']
-            percentiles = result['percentiles']
-
-            print(f"{test_name:<30} "
-                  f"{stats['total_requests']:<12,} "
-                  f"{stats['requests_per_second']:<10.2f} "
-                  f"{percentiles['p95']:<12.2f} "
-                  f"{stats['failure_rate']*100:<10.2f}")
+        # Build all rows from one template, then write them in a single call
+        format_row = SUMMARY_ROW_FORMAT.format_map
+        rows = [
+            format_row({
+                'name': result_name(result['_file']).replace('performance_results_', ''),
+                'requests': result['overall_stats']['total_requests'],
+                'rps': result['overall_stats']['requests_per_second'],
+                'p95': result['percentiles']['p95'],
+                'fail': result['overall_stats']['failure_rate'] * 100,
+            })
+            for result in self.results
+        ]
+        sys.stdout.writelines(rows)
 
 
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(description='Analyze performance test results')
-    parser.add_argument('--results', type=str, default='test_results/performance_results_*.json',
+    parser.add_argument('--results', type=str, default='test_results/performance_results_*.json*',
                        help='Pattern for performance result files')
-    parser.add_argument('--resources', type=str, default='test_results/resources_*.json',
+    parser.add_argument('--resources', type=str, default='test_results/resources_*.json*',
                        help='Pattern for resource monitoring files')
     parser.add_argument('--compare', nargs=2, metavar=('FILE1', 'FILE2'),
                        help='Compare two test result files')
     parser.add_argument('--summary', action='store_true',
                        help='Generate summary report')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Worker processes for analyzing result files (default: CPU count)')
 
     args = parser.parse_args()
 
@@ -393,14 +580,10 @@ def main():
     if args.compare:
         analyzer.compare_tests(args.compare[0], args.compare[1])
     else:
-        # Load and analyze all results
-        analyzer.load_results(args.results)
+        # Load and analyze all results (in parallel across files)
+        analyzer.load_and_analyze(args.results, workers=args.workers)
 
         if analyzer.results:
-            # Analyze each test
-            for result in analyzer.results:
-                analyzer.analyze_single_test(result)
-
             # Print summary table
             analyzer.print_test_summary_table()
 
@@ -410,7 +593,7 @@ def main():
 
         # Load and analyze resource data
         analyzer.load_resource_data(args.resources)
-        for resource_file in glob.glob(args.resources):
+        for resource_file in find_files(args.resources):
             analyzer.analyze_resources(resource_file)
 
 
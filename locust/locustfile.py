@@ -20,119 +20,310 @@ Performance Metrics Collected:
 
 from locust import HttpUser, task, between, tag, events
 from locust.runners import MasterRunner, LocalRunner
+from locust.clients import LocustHttpAdapter
+import gevent
 import random
+from bisect import bisect_right
 import logging
 import time
 import json
 import os
-from datetime import datetime
+import sys
+import gzip
+from datetime import datetime, timezone
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
 
 # Suppress some logging noise
 logging.getLogger("urllib3").setLevel(logging.WARNING)
 
-# Performance metrics storage
-performance_metrics = {
-    'start_time': None,
-    'end_time': None,
-    'total_requests': 0,
-    'total_failures': 0,
-    'response_times': [],
-    'requests_per_second': [],
-    'errors_by_type': {},
-    'endpoint_metrics': {}
+# Shared RNG for credential and hall picks (avoids the random module's global
+# function indirection; greenlets run on one thread, so sharing is safe)
+_rng = random.Random()
+
+# Performance metrics storage; populated in on_test_start by the runner that
+# writes the summary (local or master) and left empty on workers
+performance_metrics = {}
+
+# Results directory, created once at import rather than on every test stop
+RESULTS_DIR = 'test_results'
+os.makedirs(RESULTS_DIR, exist_ok=True)
+
+# Results are gzip-compressed (.json.gz) unless LOCUST_RESULTS_PLAIN is set
+RESULTS_EXTENSION = '.json' if os.getenv('LOCUST_RESULTS_PLAIN') else '.json.gz'
+
+# Per-endpoint summary fields (output key -> StatsEntry attribute)
+ENDPOINT_FIELDS = {
+    'num_requests': 'num_requests',
+    'num_failures': 'num_failures',
+    'avg_response_time': 'avg_response_time',
+    'min_response_time': 'min_response_time',
+    'max_response_time': 'max_response_time',
+    'median_response_time': 'median_response_time',
+    'requests_per_second': 'total_rps',
+    'failure_rate': 'fail_ratio',
 }
+ENDPOINT_PERCENTILES = (0.5, 0.95, 0.99)
+ENDPOINT_PERCENTILE_KEYS = ('p50', 'p95', 'p99')
+
+# Response-time samples (ms): fixed-size float32 ring buffer, overwritten
+# oldest-first once more than RESPONSE_TIME_CAPACITY requests have been made
+RESPONSE_TIME_CAPACITY = 1 << 20
+_RESPONSE_TIME_MASK = RESPONSE_TIME_CAPACITY - 1
+response_time_samples = np.empty(RESPONSE_TIME_CAPACITY, dtype=np.float32)
+response_time_count = 0
+
+# Per-endpoint [requests, failures, total response time] counters; converted
+# into performance_metrics['endpoint_metrics'] dicts when the test stops
+_endpoint_counters = {}
+
+
+@events.request.add_listener
+def on_request(name, response_time, exception=None, _samples=response_time_samples,
+               _mask=_RESPONSE_TIME_MASK, _counters=_endpoint_counters, **kwargs):
+    """Record each request's response time and bump its endpoint counters.
+
+    The containers are bound as defaults so this hot listener reads locals
+    rather than globals.
+    """
+    global response_time_count
+    _samples[response_time_count & _mask] = response_time
+    response_time_count += 1
+
+    counters = _counters.get(name)
+    if counters is None:
+        counters = _counters[name] = [0, 0, 0.0]
+    counters[0] += 1
+    counters[2] += response_time
+    if exception is not None:
+        counters[1] += 1
+
+
+def sampled_percentiles():
+    """Percentiles over the buffered samples, or None if none were recorded here."""
+    count = min(response_time_count, RESPONSE_TIME_CAPACITY)
+    if not count:
+        return None
+    p50, p75, p90, p95, p99 = np.percentile(
+        response_time_samples[:count], [50, 75, 90, 95, 99]
+    ).tolist()
+    return {'p50': p50, 'p75': p75, 'p90': p90, 'p95': p95, 'p99': p99}
+
+
+def histogram_percentiles(response_times, num_requests, percents):
+    """Locust-compatible percentiles for several percents in one histogram walk.
+
+    `response_times` is a StatsEntry histogram ({rounded ms: count}); the
+    result matches calling get_response_time_percentile once per percent,
+    but the buckets are sorted and walked only once.
+    """
+    results = [0] * len(percents)
+    # Walking from the slowest bucket down, percentile p is reached once the
+    # processed count covers everything above the int(n * p) fastest requests
+    targets = sorted((num_requests - int(num_requests * p), i) for i, p in enumerate(percents))
+    pending = 0
+    processed = 0
+    for response_time in sorted(response_times, reverse=True):
+        processed += response_times[response_time]
+        while pending < len(targets) and processed >= targets[pending][0]:
+            results[targets[pending][1]] = response_time
+            pending += 1
+        if pending == len(targets):
+            break
+    return results
+
+
+def write_summary(results_file, summary, msgpack_file=None):
+    """Serialize the summary and write it (level-1 gzip for '.gz' paths).
+
+    If `msgpack_file` is given, a MessagePack copy of the same summary is
+    written there as well, for programmatic consumers.
+    """
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(summary, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        payload = json.dumps(summary, separators=(',', ':')).encode('utf-8')
+
+    with open(results_file, 'wb', buffering=256 * 1024) as f:
+        if results_file.endswith('.gz'):
+            with gzip.GzipFile(fileobj=f, mode='wb', compresslevel=1) as gz:
+                gz.write(payload)
+        else:
+            f.write(payload)
+
+    if msgpack_file:
+        with open(msgpack_file, 'wb') as f:
+            f.write(msgpack.packb(summary, use_bin_type=True))
 
 
 @events.test_start.add_listener
 def on_test_start(environment, **kwargs):
     """Initialize metrics collection when test starts."""
-    performance_metrics['start_time'] = datetime.now()
-    logging.info(f"Performance test started at {performance_metrics['start_time']}")
+    # Start each run (web UI "New test", runner restart) with an empty ring
+    # buffer and no endpoint counters; the dict is cleared in place because
+    # on_request holds it as a default argument
+    global response_time_count
+    response_time_count = 0
+    _endpoint_counters.clear()
+
+    if not isinstance(environment.runner, (MasterRunner, LocalRunner)):
+        return
+    performance_metrics.update(start_ns=time.time_ns(), end_ns=None, endpoint_metrics={})
+    logging.info("Performance test started")
 
 
 @events.test_stop.add_listener
 def on_test_stop(environment, **kwargs):
     """Save metrics when test stops."""
-    performance_metrics['end_time'] = datetime.now()
+    if not performance_metrics:
+        return  # worker: the master aggregates and writes the summary
+
+    performance_metrics['end_ns'] = end_ns = time.time_ns()
+    start_ns = performance_metrics['start_ns']
+    performance_metrics['endpoint_metrics'] = {
+        name: {'num_requests': requests, 'num_failures': failures,
+               'total_response_time': total_time}
+        for name, (requests, failures, total_time) in _endpoint_counters.items()
+    }
 
     # Calculate summary statistics
     stats = environment.stats
+    total = stats.total
+    getp = total.get_response_time_percentile
 
     # Save detailed metrics to file
-    results_dir = 'test_results'
-    os.makedirs(results_dir, exist_ok=True)
-
-    timestamp = performance_metrics['start_time'].strftime('%Y%m%d_%H%M%S')
-    results_file = f"{results_dir}/performance_results_{timestamp}.json"
+    # Timestamps are kept as integer ns and formatted once, here (UTC)
+    timestamp = time.strftime('%Y%m%d_%H%M%S', time.gmtime(start_ns // 1_000_000_000))
+    results_base = f"{RESULTS_DIR}/performance_results_{timestamp}"
+    results_file = results_base + RESULTS_EXTENSION
+    msgpack_file = results_base + '.msgpack' if MSGPACK_AVAILABLE else None
 
     summary = {
         'test_info': {
-            'start_time': performance_metrics['start_time'].isoformat(),
-            'end_time': performance_metrics['end_time'].isoformat(),
-            'duration_seconds': (performance_metrics['end_time'] - performance_metrics['start_time']).total_seconds(),
+            'start_time': datetime.fromtimestamp(start_ns / 1e9, timezone.utc).isoformat(),
+            'end_time': datetime.fromtimestamp(end_ns / 1e9, timezone.utc).isoformat(),
+            'duration_seconds': (end_ns - start_ns) / 1e9,
             'host': environment.host
         },
         'overall_stats': {
-            'total_requests': stats.total.num_requests,
-            'total_failures': stats.total.num_failures,
-            'failure_rate': stats.total.fail_ratio,
-            'average_response_time': stats.total.avg_response_time,
-            'min_response_time': stats.total.min_response_time,
-            'max_response_time': stats.total.max_response_time,
-            'median_response_time': stats.total.median_response_time,
-            'avg_content_length': stats.total.avg_content_length,
-            'requests_per_second': stats.total.total_rps,
-            'total_rps': stats.total.current_rps
-        },
-        'percentiles': {
-            'p50': stats.total.get_response_time_percentile(0.5),
-            'p75': stats.total.get_response_time_percentile(0.75),
-            'p90': stats.total.get_response_time_percentile(0.90),
-            'p95': stats.total.get_response_time_percentile(0.95),
-            'p99': stats.total.get_response_time_percentile(0.99)
+            'total_requests': total.num_requests,
+            'total_failures': total.num_failures,
+            'failure_rate': total.fail_ratio,
+            'average_response_time': total.avg_response_time,
+            'min_response_time': total.min_response_time,
+            'max_response_time': total.max_response_time,
+            'median_response_time': total.median_response_time,
+            'avg_content_length': total.avg_content_length,
+            'requests_per_second': total.total_rps,
+            'total_rps': total.current_rps
         },
-        'endpoint_details': {}
+        # Samples are only recorded where requests run; a distributed master
+        # falls back to Locust's aggregated response-time histogram
+        'percentiles': sampled_percentiles() or {
+            'p50': getp(0.5),
+            'p75': getp(0.75),
+            'p90': getp(0.90),
+            'p95': getp(0.95),
+            'p99': getp(0.99)
+        }
     }
 
-    # Per-endpoint statistics
-    for name, endpoint_stats in stats.entries.items():
-        summary['endpoint_details'][name] = {
-            'num_requests': endpoint_stats.num_requests,
-            'num_failures': endpoint_stats.num_failures,
-            'avg_response_time': endpoint_stats.avg_response_time,
-            'min_response_time': endpoint_stats.min_response_time,
-            'max_response_time': endpoint_stats.max_response_time,
-            'median_response_time': endpoint_stats.median_response_time,
-            'requests_per_second': endpoint_stats.total_rps,
-            'failure_rate': endpoint_stats.fail_ratio,
-            'percentiles': {
-                'p50': endpoint_stats.get_response_time_percentile(0.5),
-                'p95': endpoint_stats.get_response_time_percentile(0.95),
-                'p99': endpoint_stats.get_response_time_percentile(0.99)
-            }
+    # Per-endpoint statistics (entries are keyed by (name, method) tuples,
+    # which JSON cannot use as object keys), gathered column-wise in one scan
+    names = []
+    columns = {key: [] for key in ENDPOINT_FIELDS}
+    endpoint_percentiles = []
+    for (name, method), endpoint_stats in stats.entries.items():
+        names.append(f"{method} {name}")
+        for key, attr in ENDPOINT_FIELDS.items():
+            columns[key].append(getattr(endpoint_stats, attr))
+        endpoint_percentiles.append(histogram_percentiles(
+            endpoint_stats.response_times,
+            endpoint_stats.num_requests - endpoint_stats.num_none_requests,
+            ENDPOINT_PERCENTILES
+        ))
+
+    summary['endpoint_details'] = {
+        name: {
+            **{key: column[i] for key, column in columns.items()},
+            'percentiles': dict(zip(ENDPOINT_PERCENTILE_KEYS, endpoint_percentiles[i]))
         }
+        for i, name in enumerate(names)
+    }
 
-    # Save to file
-    with open(results_file, 'w') as f:
-        json.dump(summary, f, indent=2)
+    # Serialize and write on a native thread from gevent's pool, so the
+    # event loop (web UI, runner messages) keeps running meanwhile
+    writer = gevent.get_hub().threadpool.spawn(write_summary, results_file, summary, msgpack_file)
+    writer.get(timeout=30)
 
     logging.info(f"Performance metrics saved to {results_file}")
 
-    # Print summary to console
-    print("\n" + "="*80)
-    print("PERFORMANCE TEST SUMMARY")
-    print("="*80)
-    print(f"Duration: {summary['test_info']['duration_seconds']:.2f} seconds")
-    print(f"Total Requests: {summary['overall_stats']['total_requests']}")
-    print(f"Total Failures: {summary['overall_stats']['total_failures']}")
-    print(f"Failure Rate: {summary['overall_stats']['failure_rate']*100:.2f}%")
-    print(f"Requests/Second: {summary['overall_stats']['requests_per_second']:.2f}")
-    print(f"\nResponse Times:")
-    print(f"  Average: {summary['overall_stats']['average_response_time']:.2f} ms")
-    print(f"  Median (p50): {summary['percentiles']['p50']:.2f} ms")
-    print(f"  p95: {summary['percentiles']['p95']:.2f} ms")
-    print(f"  p99: {summary['percentiles']['p99']:.2f} ms")
-    print("="*80 + "\n")
+    # Print summary to console (one write instead of a print per line)
+    overall = summary['overall_stats']
+    percentiles = summary['percentiles']
+    rule = "=" * 80
+    sys.stdout.write(
+        f"\n{rule}\n"
+        "PERFORMANCE TEST SUMMARY\n"
+        f"{rule}\n"
+        f"Duration: {summary['test_info']['duration_seconds']:.2f} seconds\n"
+        f"Total Requests: {overall['total_requests']}\n"
+        f"Total Failures: {overall['total_failures']}\n"
+        f"Failure Rate: {overall['failure_rate']*100:.2f}%\n"
+        f"Requests/Second: {overall['requests_per_second']:.2f}\n"
+        "\nResponse Times:\n"
+        f"  Average: {overall['average_response_time']:.2f} ms\n"
+        f"  Median (p50): {percentiles['p50']:.2f} ms\n"
+        f"  p95: {percentiles['p95']:.2f} ms\n"
+        f"  p99: {percentiles['p99']:.2f} ms\n"
+        f"{rule}\n\n"
+    )
+    sys.stdout.flush()
+
+
+def _no_redirects(*args, **kwargs):
+    """Session.resolve_redirects stand-in that yields no follow-up requests."""
+    return iter(())
+
+
+def login_bodies(*credentials):
+    """Prebuild the /login form bodies for (username, password) pairs."""
+    return tuple({"username": username, "password": password}
+                 for username, password in credentials)
+
+
+# Prebuilt login form bodies (from seed data), shared by all users of a role
+_PLAYER_LOGIN_BODIES = login_bodies(
+    ("magnus", "1234"),
+    ("hikaru", "1234"),
+    ("fabiano", "1234"),
+    ("ding", "1234"),
+    ("anish", "1234"),
+)
+_COACH_LOGIN_BODIES = login_bodies(
+    ("coach_alpha", "1234"),
+    ("coach_beta", "1234"),
+)
+_ARBITER_LOGIN_BODIES = login_bodies(
+    ("arbiter1", "1234"),
+    ("arbiter2", "1234"),
+)
+_MANAGER_LOGIN_BODIES = login_bodies(
+    ("admin", "1234"),
+)
+_API_LOGIN_BODY = login_bodies(("coach_alpha", "1234"))[0]
+_BAD_LOGIN_BODY = login_bodies(("test_user", "wrong_password"))[0]
 
 
 class ChessUser(HttpUser):
@@ -141,39 +332,56 @@ class ChessUser(HttpUser):
     abstract = True
     wait_time = between(1, 5)
 
-    def login(self, username, password):
-        """Perform login and return success status."""
-        response = self.client.post("/login", data={
-            "username": username,
-            "password": password
-        }, allow_redirects=False)
+    # HttpUser instances still carry a __dict__, but the one attribute set per
+    # user gets a fixed slot; subclasses declare empty slots to keep it that way
+    __slots__ = ('username',)
+
+    # Hall tables API URLs indexed by hall_id, and their shared stats name
+    HALL_TABLE_URLS = tuple(f"/api/halls/{hall_id}/tables" for hall_id in range(11))
+    HALL_TABLE_NAME = "/api/halls/[id]/tables"
+
+    # Keep-alive pool: one host, enough connections for the parallel hall
+    # table fetches, and no transparent retries skewing the latency stats
+    POOL_MAXSIZE = 32
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # LocustHttpAdapter keeps Locust's preloaded SSL context
+        adapter = LocustHttpAdapter(
+            pool_manager=self.pool_manager,
+            pool_connections=1,
+            pool_maxsize=self.POOL_MAXSIZE,
+            max_retries=0
+        )
+        self.client.mount("http://", adapter)
+        self.client.mount("https://", adapter)
+        self.client.headers['Connection'] = 'keep-alive'
+        # Never follow redirects: every response is recorded as the server
+        # sent it, so calls no longer need to pass allow_redirects=False
+        self.client.resolve_redirects = _no_redirects
+
+    def login(self, body):
+        """Perform login with a prebuilt form body and return success status."""
+        response = self.client.post("/login", data=body)
         return response.status_code in [200, 302]
 
     def logout(self):
         """Perform logout."""
-        self.client.get("/logout", allow_redirects=False)
+        self.client.get("/logout")
 
 
 class PlayerUser(ChessUser):
     """Simulates player behavior - most common user type."""
 
+    __slots__ = ()
     weight = 5  # Most common user type
 
-    # Test credentials (from seed data)
-    player_credentials = [
-        ("magnus", "1234"),
-        ("hikaru", "1234"),
-        ("fabiano", "1234"),
-        ("ding", "1234"),
-        ("anish", "1234"),
-    ]
-
     def on_start(self):
         """Login as a player on user start."""
-        creds = random.choice(self.player_credentials)
-        self.username = creds[0]
-        if not self.login(creds[0], creds[1]):
-            logging.warning(f"Failed to login as player {creds[0]}")
+        body = _rng.choice(_PLAYER_LOGIN_BODIES)
+        self.username = body["username"]
+        if not self.login(body):
+            logging.warning(f"Failed to login as player {self.username}")
 
     def on_stop(self):
         """Logout on user stop."""
@@ -213,19 +421,15 @@ class PlayerUser(ChessUser):
 class CoachUser(ChessUser):
     """Simulates coach behavior."""
 
+    __slots__ = ()
     weight = 2
 
-    coach_credentials = [
-        ("coach_alpha", "1234"),
-        ("coach_beta", "1234"),
-    ]
-
     def on_start(self):
         """Login as a coach."""
-        creds = random.choice(self.coach_credentials)
-        self.username = creds[0]
-        if not self.login(creds[0], creds[1]):
-            logging.warning(f"Failed to login as coach {creds[0]}")
+        body = _rng.choice(_COACH_LOGIN_BODIES)
+        self.username = body["username"]
+        if not self.login(body):
+            logging.warning(f"Failed to login as coach {self.username}")
 
     def on_stop(self):
         self.logout()
@@ -252,27 +456,22 @@ class CoachUser(ChessUser):
     @tag("api", "tables")
     def get_hall_tables(self):
         """Get tables for a random hall via API."""
-        hall_id = random.randint(1, 5)
-        self.client.get(f"/api/halls/{hall_id}/tables",
-                        name="/api/halls/[id]/tables")
+        self.client.get(self.HALL_TABLE_URLS[_rng.randrange(1, 6)],
+                        name=self.HALL_TABLE_NAME)
 
 
 class ArbiterUser(ChessUser):
     """Simulates arbiter behavior."""
 
+    __slots__ = ()
     weight = 2
 
-    arbiter_credentials = [
-        ("arbiter1", "1234"),
-        ("arbiter2", "1234"),
-    ]
-
     def on_start(self):
         """Login as an arbiter."""
-        creds = random.choice(self.arbiter_credentials)
-        self.username = creds[0]
-        if not self.login(creds[0], creds[1]):
-            logging.warning(f"Failed to login as arbiter {creds[0]}")
+        body = _rng.choice(_ARBITER_LOGIN_BODIES)
+        self.username = body["username"]
+        if not self.login(body):
+            logging.warning(f"Failed to login as arbiter {self.username}")
 
     def on_stop(self):
         self.logout()
@@ -299,18 +498,15 @@ class ArbiterUser(ChessUser):
 class ManagerUser(ChessUser):
     """Simulates manager behavior."""
 
+    __slots__ = ()
     weight = 1
 
-    manager_credentials = [
-        ("admin", "1234"),
-    ]
-
     def on_start(self):
         """Login as a manager."""
-        creds = random.choice(self.manager_credentials)
-        self.username = creds[0]
-        if not self.login(creds[0], creds[1]):
-            logging.warning(f"Failed to login as manager {creds[0]}")
+        body = _rng.choice(_MANAGER_LOGIN_BODIES)
+        self.username = body["username"]
+        if not self.login(body):
+            logging.warning(f"Failed to login as manager {self.username}")
 
     def on_stop(self):
         self.logout()
@@ -343,6 +539,7 @@ class ManagerUser(ChessUser):
 class AnonymousUser(ChessUser):
     """Simulates anonymous (not logged in) user behavior."""
 
+    __slots__ = ()
     weight = 3
 
     @task(5)
@@ -361,20 +558,18 @@ class AnonymousUser(ChessUser):
     @tag("anonymous", "login_attempt")
     def attempt_login(self):
         """Attempt to login (simulates user trying to login)."""
-        self.client.post("/login", data={
-            "username": "test_user",
-            "password": "wrong_password"
-        }, name="/login [POST]")
+        self.client.post("/login", data=_BAD_LOGIN_BODY, name="/login [POST]")
 
 
 class APIUser(ChessUser):
     """Dedicated API testing user."""
 
+    __slots__ = ()
     weight = 1
 
     def on_start(self):
         """Login to access API."""
-        if not self.login("coach_alpha", "1234"):
+        if not self.login(_API_LOGIN_BODY):
             logging.warning("Failed to login for API testing")
 
     def on_stop(self):
@@ -384,17 +579,17 @@ class APIUser(ChessUser):
     @tag("api", "tables")
     def get_hall_tables_random(self):
         """Get tables for random halls."""
-        hall_id = random.randint(1, 10)
-        self.client.get(f"/api/halls/{hall_id}/tables",
-                        name="/api/halls/[id]/tables")
+        self.client.get(self.HALL_TABLE_URLS[_rng.randrange(1, 11)],
+                        name=self.HALL_TABLE_NAME)
 
     @task(1)
     @tag("api", "tables")
     def get_hall_tables_sequential(self):
-        """Get tables for all halls sequentially."""
-        for hall_id in range(1, 6):
-            self.client.get(f"/api/halls/{hall_id}/tables",
-                            name="/api/halls/[id]/tables")
+        """Get tables for halls 1-5, issuing the requests concurrently."""
+        jobs = [gevent.spawn(self.client.get, url, name=self.HALL_TABLE_NAME)
+                for url in self.HALL_TABLE_URLS[1:6]]
+        gevent.joinall(jobs, timeout=30)
+        gevent.killall(jobs, block=False)
 
 
 # Custom load test shapes
@@ -422,12 +617,10 @@ class StagesShape:
         {"duration": 360, "users": 10, "spawn_rate": 1},
     ]
 
-    def tick(self):
-        run_time = self.get_run_time()
-
-        for stage in self.stages:
-            if run_time < stage["duration"]:
-                tick_data = (stage["users"], stage["spawn_rate"])
-                return tick_data
+    # Stage end times and their (users, spawn_rate) ticks, for bisect lookup
+    _stage_ends = [stage["duration"] for stage in stages]
+    _stage_ticks = [(stage["users"], stage["spawn_rate"]) for stage in stages]
 
-        return None
+    def tick(self):
+        i = bisect_right(self._stage_ends, self.get_run_time())
+        return self._stage_ticks[i] if i < len(self._stage_ticks) else None
@@ -13,36 +13,249 @@ Usage:
 """
 
 import psutil
+import numpy as np
 import time
 import json
 import argparse
 import sys
 import os
-from datetime import datetime
+import gzip
+import queue
+import threading
+from datetime import datetime, timedelta
 from collections import defaultdict
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 try:
     import docker
     DOCKER_AVAILABLE = True
 except ImportError:
     DOCKER_AVAILABLE = False
 
+# cgroup v2 directories holding a container's control files, by cgroup driver
+CGROUP_DIRS = (
+    '/sys/fs/cgroup/system.slice/docker-{id}.scope',  # systemd driver
+    '/sys/fs/cgroup/docker/{id}',                     # cgroupfs driver
+)
+CGROUP_FILES = ('cpu.stat', 'memory.current', 'memory.max')
+
+# procfs sources read directly on Linux (elsewhere psutil is used instead)
+PROC_FILES = ('/proc/stat', '/proc/meminfo', '/proc/net/dev')
+PROC_AVAILABLE = all(os.path.exists(path) for path in PROC_FILES)
+PROC_READ_SIZE = 64 * 1024
+# Disk usage barely moves between samples; statvfs('/') at most this often
+DISK_REFRESH_SECONDS = 30
+
+
+def _read_proc(fd):
+    """Whole contents of an open procfs file, re-read from offset 0."""
+    data = os.pread(fd, PROC_READ_SIZE, 0)
+    if len(data) < PROC_READ_SIZE:
+        return data  # the usual case: one pread covers the whole file
+    parts = [data]
+    offset = len(data)
+    while len(data) == PROC_READ_SIZE:
+        data = os.pread(fd, PROC_READ_SIZE, offset)
+        parts.append(data)
+        offset += len(data)
+    return b''.join(parts)
+
+
+def _parse_stat_cpus(buf):
+    """Per-CPU (busy, total) jiffies from /proc/stat, matching psutil.
+
+    Only the per-CPU lines are located and split; guest/guest_nice are
+    already counted in user/nice, so the first eight fields make up the
+    total, and idle and iowait are not busy time.
+    """
+    cpus = []
+    pos = buf.find(b'\ncpu0')
+    while pos != -1:
+        end = buf.find(b'\n', pos + 1)
+        fields = buf[pos + 1:end].split(None, 9)
+        user, nice, system, idle, iowait, irq, softirq, steal = map(int, fields[1:9])
+        total = user + nice + system + idle + iowait + irq + softirq + steal
+        cpus.append((total - idle - iowait, total))
+        pos = buf.find(b'\ncpu', end)
+    return cpus
+
+
+_MEMINFO_KEYS = (b'MemTotal:', b'MemFree:', b'MemAvailable:')
+
+
+def _parse_meminfo(buf):
+    """(MemTotal, MemFree, MemAvailable) in bytes from /proc/meminfo.
+
+    Each value is sliced straight out of the buffer next to its key rather
+    than splitting the whole file into lines.
+    """
+    values = []
+    for key in _MEMINFO_KEYS:
+        start = buf.index(key) + len(key)
+        values.append(int(buf[start:buf.index(b' kB', start)]) * 1024)
+    return tuple(values)
+
+
+def _parse_net_dev(buf):
+    """(bytes_sent, bytes_recv, packets_sent, packets_recv) over all interfaces."""
+    bytes_sent = bytes_recv = packets_sent = packets_recv = 0
+    for line in buf.split(b'\n')[2:]:
+        fields = line.rpartition(b':')[2].split()
+        if len(fields) >= 10:
+            bytes_recv += int(fields[0])
+            packets_recv += int(fields[1])
+            bytes_sent += int(fields[8])
+            packets_sent += int(fields[9])
+    return bytes_sent, bytes_recv, packets_sent, packets_recv
+
+
+def open_output(path):
+    """Open a results file for binary writing; '.gz' paths are gzip level 1."""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'wb', compresslevel=1)
+    return open(path, 'wb')
+
+
+def series_summary(values):
+    """min/max/avg/median of a sample series.
+
+    The median is the upper middle element (as the sorted-list version
+    reported), selected with an O(n) partition instead of a full sort.
+    """
+    middle = len(values) // 2
+    return {
+        'min': float(values.min()),
+        'max': float(values.max()),
+        'avg': float(values.mean()),
+        'median': float(np.partition(values, middle)[middle])
+    }
+
+
+def container_memory_percent(usage, limit):
+    """Memory usage as a percent of the limit (0 without a limit); works on arrays."""
+    if isinstance(limit, np.ndarray):
+        return np.divide(usage * 100.0, limit, out=np.zeros(len(limit)), where=limit > 0)
+    return (usage / limit) * 100.0 if limit > 0 else 0
+
+
+# Stored sample layout: column -> (dtype, per-sample shape). Samples are kept
+# column-wise and only rebuilt as nested dicts when results are saved
+SYSTEM_COLUMNS = {
+    't_ns': (np.int64, ()),
+    'cpu_percent': (np.float64, ()),
+    'mem_total': (np.int64, ()),
+    'mem_available': (np.int64, ()),
+    'mem_used': (np.int64, ()),
+    'mem_percent': (np.float64, ()),
+    'mem_free': (np.int64, ()),
+    'disk_total': (np.int64, ()),
+    'disk_used': (np.int64, ()),
+    'disk_free': (np.int64, ()),
+    'disk_percent': (np.float64, ()),
+    'bytes_sent': (np.int64, ()),
+    'bytes_recv': (np.int64, ()),
+    'packets_sent': (np.int64, ()),
+    'packets_recv': (np.int64, ()),
+}
+CONTAINER_COLUMNS = {
+    'sample_index': (np.int64, ()),
+    't_ns': (np.int64, ()),
+    'cpu_percent': (np.float64, ()),
+    'mem_usage': (np.int64, ()),
+    'mem_limit': (np.int64, ()),
+    'network': (object, ()),
+    'blkio': (object, ()),
+}
+
+# When samples are streamed to a samples file, only the series the summary
+# needs stay in memory
+SYSTEM_SUMMARY_COLUMNS = {name: SYSTEM_COLUMNS[name] for name in ('cpu_percent', 'mem_percent')}
+CONTAINER_SUMMARY_COLUMNS = {name: CONTAINER_COLUMNS[name]
+                             for name in ('cpu_percent', 'mem_usage', 'mem_limit')}
+
+# Samples-file writer: flush at most every SAMPLE_FLUSH_INTERVAL seconds or
+# SAMPLE_BATCH_SIZE samples, with up to SAMPLE_QUEUE_SIZE samples pending
+SAMPLE_FLUSH_INTERVAL = 0.1
+SAMPLE_BATCH_SIZE = 256
+SAMPLE_QUEUE_SIZE = 1024
+# How often a put on a full queue re-checks that the writer is still running
+SAMPLE_PUT_TIMEOUT = 1.0
+
+
+class SampleColumns:
+    """Sample series stored column-wise in growable NumPy arrays."""
+
+    GROW_BY = 4096
+
+    def __init__(self, layout, capacity=GROW_BY):
+        self.count = 0
+        self._columns = {name: np.empty((capacity,) + shape, dtype=dtype)
+                         for name, (dtype, shape) in layout.items()}
+        self._capacity = capacity
+
+    def reserve(self, capacity):
+        """Make room for at least `capacity` samples without further growth."""
+        if capacity > self._capacity:
+            for name, column in self._columns.items():
+                grown = np.empty((capacity,) + column.shape[1:], dtype=column.dtype)
+                grown[:self.count] = column[:self.count]
+                self._columns[name] = grown
+            self._capacity = capacity
+
+    def append(self, **values):
+        """Store one sample; values for columns outside the layout are ignored."""
+        if self.count == self._capacity:
+            self.reserve(self._capacity + self.GROW_BY)
+        index = self.count
+        for name, column in self._columns.items():
+            column[index] = values[name]
+        self.count = index + 1
+
+    def __getitem__(self, name):
+        return self._columns[name][:self.count]
+
+    def names(self):
+        """Column names, in layout order."""
+        return list(self._columns)
+
 
 class ResourceMonitor:
     """Monitor system and application resources."""
 
-    def __init__(self, interval=1, container_name=None):
+    def __init__(self, interval=1, container_name=None, samples_file=None):
         """
         Initialize resource monitor.
 
         Args:
             interval: Sampling interval in seconds
             container_name: Docker container name to monitor (optional)
+            samples_file: Stream samples to this NDJSON file (gzipped for
+                '.gz') instead of keeping them for the results file (optional)
         """
         self.interval = interval
         self.container_name = container_name
+        self.samples_file = samples_file
+        # Samples carry monotonic ns offsets from this instant; wall-clock
+        # timestamps are only formatted when samples are written out
+        self._start_wall = datetime.now()
+        self._start_mono_ns = time.monotonic_ns()
+        self._sample_queue = None
+        self._sample_writer = None
+        self._sample_writer_error = None
         self.docker_client = None
         self.container = None
+        self._stats_lock = threading.Lock()
+        self._latest_container_stats = None
+        self._stats_stream_started = False
+        self._cgroup_fds = None
+        self._prev_cgroup_cpu = None
+        self._closed = False
+        self._missed = 0
 
         if container_name and DOCKER_AVAILABLE:
             try:
@@ -52,152 +265,406 @@ class ResourceMonitor:
                 print(f"Warning: Could not connect to Docker container '{container_name}': {e}")
                 print("Falling back to system-wide monitoring")
 
+        if self.container:
+            # Read the container's cgroup files directly where the host exposes
+            # them; Docker Desktop/linuxkit only offer the stats API
+            self._cgroup_fds = self._open_cgroup_files(self.container.id)
+            if self._cgroup_fds:
+                self._prev_cgroup_cpu = (self._read_cgroup_cpu_usage(), time.monotonic())
+            else:
+                self._start_stats_stream()
+
+        # CPU readings cover the time since the previous sample, so prime the
+        # counters now: procfs jiffies on Linux, psutil's own state elsewhere
+        self._proc_fds = None
+        if PROC_AVAILABLE:
+            self._proc_fds = tuple(os.open(path, os.O_RDONLY) for path in PROC_FILES)
+            self._prev_cpu_times = _parse_stat_cpus(_read_proc(self._proc_fds[0]))
+            n_cpus = len(self._prev_cpu_times)
+        else:
+            n_cpus = len(psutil.cpu_percent(interval=None, percpu=True))
+        self._cpu_count = psutil.cpu_count()
+        self._disk_every = max(1, int(DISK_REFRESH_SECONDS / interval))
+        self._disk_cached = None
+        self._n = 0
+
+        if samples_file:
+            self._system_samples = SampleColumns(SYSTEM_SUMMARY_COLUMNS)
+            self._container_samples = SampleColumns(CONTAINER_SUMMARY_COLUMNS)
+        else:
+            self._system_samples = SampleColumns(
+                dict(SYSTEM_COLUMNS, per_cpu=(np.float64, (n_cpus,))))
+            self._container_samples = SampleColumns(CONTAINER_COLUMNS)
+
         self.metrics = {
             'start_time': None,
             'end_time': None,
             'interval': interval,
-            'samples': [],
             'summary': {}
         }
 
-    def get_system_metrics(self):
-        """Get current system-wide metrics."""
-        cpu_percent = psutil.cpu_percent(interval=0.1)
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
+    def _read_proc_metrics(self):
+        """Per-CPU percents, memory and network totals from the open procfs files."""
+        stat_fd, meminfo_fd, net_dev_fd = self._proc_fds
+
+        cpu_times = _parse_stat_cpus(_read_proc(stat_fd))
+        per_cpu = []
+        for (busy, total), (prev_busy, prev_total) in zip(cpu_times, self._prev_cpu_times):
+            total_delta = total - prev_total
+            percent = (busy - prev_busy) / total_delta * 100 if total_delta > 0 else 0.0
+            per_cpu.append(round(min(max(percent, 0.0), 100.0), 1))
+        self._prev_cpu_times = cpu_times
+
+        total, free, available = _parse_meminfo(_read_proc(meminfo_fd))
+        used = total - available
+        memory = (total, available, used, round(used / total * 100, 1), free)
+
+        return per_cpu, memory, _parse_net_dev(_read_proc(net_dev_fd))
+
+    def _read_psutil_metrics(self):
+        """The same readings as _read_proc_metrics, through psutil."""
+        per_cpu = psutil.cpu_percent(interval=None, percpu=True)
+        vm = psutil.virtual_memory()
         net_io = psutil.net_io_counters()
+        memory = (vm.total, vm.available, vm.used, vm.percent, vm.free)
+        network = (net_io.bytes_sent, net_io.bytes_recv, net_io.packets_sent, net_io.packets_recv)
+        return per_cpu, memory, network
+
+    def read_system_row(self):
+        """Read system-wide metrics as one row of SYSTEM_COLUMNS (plus per_cpu)."""
+        t_ns = time.monotonic_ns() - self._start_mono_ns
+        if self._proc_fds:
+            per_cpu, memory, network = self._read_proc_metrics()
+        else:
+            per_cpu, memory, network = self._read_psutil_metrics()
+        cpu_percent = sum(per_cpu) / len(per_cpu)
+        if self._n % self._disk_every == 0:
+            self._disk_cached = psutil.disk_usage('/')
+        self._n += 1
+        disk = self._disk_cached
+        mem_total, mem_available, mem_used, mem_percent, mem_free = memory
+        bytes_sent, bytes_recv, packets_sent, packets_recv = network
 
         return {
-            'timestamp': datetime.now().isoformat(),
-            'cpu': {
-                'percent': cpu_percent,
-                'count': psutil.cpu_count(),
-                'per_cpu': psutil.cpu_percent(interval=0.1, percpu=True)
-            },
-            'memory': {
-                'total': memory.total,
-                'available': memory.available,
-                'used': memory.used,
-                'percent': memory.percent,
-                'free': memory.free
-            },
-            'disk': {
-                'total': disk.total,
-                'used': disk.used,
-                'free': disk.free,
-                'percent': disk.percent
-            },
-            'network': {
-                'bytes_sent': net_io.bytes_sent,
-                'bytes_recv': net_io.bytes_recv,
-                'packets_sent': net_io.packets_sent,
-                'packets_recv': net_io.packets_recv
-            }
+            't_ns': t_ns, 'cpu_percent': cpu_percent, 'per_cpu': per_cpu,
+            'mem_total': mem_total, 'mem_available': mem_available, 'mem_used': mem_used,
+            'mem_percent': mem_percent, 'mem_free': mem_free,
+            'disk_total': disk.total, 'disk_used': disk.used, 'disk_free': disk.free,
+            'disk_percent': disk.percent,
+            'bytes_sent': bytes_sent, 'bytes_recv': bytes_recv,
+            'packets_sent': packets_sent, 'packets_recv': packets_recv
         }
 
-    def get_container_metrics(self):
-        """Get Docker container metrics."""
+    def _open_cgroup_files(self, container_id):
+        """Open the container's cgroup v2 control files, or return None."""
+        for template in CGROUP_DIRS:
+            cgroup_dir = template.format(id=container_id)
+            if os.path.isdir(cgroup_dir):
+                try:
+                    return tuple(os.open(os.path.join(cgroup_dir, name), os.O_RDONLY)
+                                 for name in CGROUP_FILES)
+                except OSError:
+                    return None
+        return None
+
+    def _read_cgroup_cpu_usage(self):
+        """Cumulative CPU time of the container in microseconds (cpu.stat)."""
+        buf = os.pread(self._cgroup_fds[0], 4096, 0)
+        start = buf.index(b'usage_usec ') + len(b'usage_usec ')
+        return int(buf[start:buf.index(b'\n', start)])
+
+    def _read_cgroup_metrics(self):
+        """CPU percent and memory usage/limit read straight from cgroupfs."""
+        usage_usec = self._read_cgroup_cpu_usage()
+        now = time.monotonic()
+        prev_usage, prev_time = self._prev_cgroup_cpu
+        self._prev_cgroup_cpu = (usage_usec, now)
+        elapsed_usec = (now - prev_time) * 1e6
+        # Percent of one CPU, as `docker stats` reports it
+        cpu_percent = (usage_usec - prev_usage) / elapsed_usec * 100.0 if elapsed_usec > 0 else 0
+
+        memory_usage = int(os.pread(self._cgroup_fds[1], 64, 0))
+        memory_max = os.pread(self._cgroup_fds[2], 64, 0).strip()
+        # An unlimited container reports 'max'; Docker shows host memory then
+        memory_limit = psutil.virtual_memory().total if memory_max == b'max' else int(memory_max)
+        return cpu_percent, memory_usage, memory_limit
+
+    def _close_cgroup_files(self):
+        """Close the cached cgroup file descriptors."""
+        if self._cgroup_fds:
+            for fd in self._cgroup_fds:
+                os.close(fd)
+            self._cgroup_fds = None
+
+    def _start_stats_stream(self):
+        """Start the background reader of dockerd's stats stream (once)."""
+        if self._stats_stream_started:
+            return
+        self._stats_stream_started = True
+        threading.Thread(target=self._stream_container_stats,
+                         name='container-stats', daemon=True).start()
+
+    def _stream_container_stats(self):
+        """Keep the latest sample from dockerd's stats stream (runs in a thread)."""
+        try:
+            for raw in self.container.stats(stream=True, decode=True):
+                with self._stats_lock:
+                    self._latest_container_stats = raw
+        except Exception as e:
+            if not self._closed:
+                print(f"Container stats stream ended: {e}")
+
+    def read_container_metrics(self):
+        """Docker container metrics (cgroupfs first, else the stats stream).
+
+        Returns (cpu %, memory usage, memory limit, network, blkio), or None;
+        network/blkio are only available from the stats API.
+        """
         if not self.container:
             return None
 
-        try:
-            stats = self.container.stats(stream=False)
+        if self._cgroup_fds:
+            try:
+                cpu_percent, memory_usage, memory_limit = self._read_cgroup_metrics()
+                return cpu_percent, memory_usage, memory_limit, {}, {}
+            except (OSError, ValueError) as e:
+                # Container restarted or removed its cgroup: use the API instead
+                print(f"Cgroup stats unavailable ({e}), falling back to the Docker API")
+                self._close_cgroup_files()
+                self._start_stats_stream()
+
+        with self._stats_lock:
+            stats = self._latest_container_stats
+        if stats is None:
+            return None  # first streamed sample not received yet
 
+        try:
             # Calculate CPU percentage
             cpu_delta = stats['cpu_stats']['cpu_usage']['total_usage'] - \
                        stats['precpu_stats']['cpu_usage']['total_usage']
             system_delta = stats['cpu_stats']['system_cpu_usage'] - \
                           stats['precpu_stats']['system_cpu_usage']
-            cpu_percent = (cpu_delta / system_delta) * len(stats['cpu_stats']['cpu_usage']['percpu_usage']) * 100.0 if system_delta > 0 else 0
+            online_cpus = stats['cpu_stats'].get('online_cpus') or \
+                len(stats['cpu_stats']['cpu_usage']['percpu_usage'])
+            cpu_percent = (cpu_delta / system_delta) * online_cpus * 100.0 if system_delta > 0 else 0
 
             # Memory stats
             memory_usage = stats['memory_stats'].get('usage', 0)
             memory_limit = stats['memory_stats'].get('limit', 1)
-            memory_percent = (memory_usage / memory_limit) * 100.0 if memory_limit > 0 else 0
-
-            return {
-                'timestamp': datetime.now().isoformat(),
-                'container_name': self.container_name,
-                'cpu_percent': cpu_percent,
-                'memory': {
-                    'usage': memory_usage,
-                    'limit': memory_limit,
-                    'percent': memory_percent,
-                    'usage_mb': memory_usage / (1024 * 1024),
-                    'limit_mb': memory_limit / (1024 * 1024)
-                },
-                'network': stats.get('networks', {}),
-                'blkio': stats.get('blkio_stats', {})
-            }
+
+            return (cpu_percent, memory_usage, memory_limit,
+                    stats.get('networks', {}), stats.get('blkio_stats', {}))
         except Exception as e:
             print(f"Error getting container stats: {e}")
             return None
 
     def collect_sample(self):
-        """Collect one sample of metrics."""
-        sample = {
-            'system': self.get_system_metrics()
-        }
+        """Collect and store one sample of metrics.
 
-        if self.container:
-            container_metrics = self.get_container_metrics()
-            if container_metrics:
-                sample['container'] = container_metrics
+        Returns (cpu %, memory %, container cpu %, container memory %) for the
+        live status line; the container values are None without a reading.
+        """
+        system = self.read_system_row()
+        self._system_samples.append(**system)
+
+        container = None
+        reading = self.read_container_metrics() if self.container else None
+        if reading is not None:
+            cpu_percent, mem_usage, mem_limit, network, blkio = reading
+            container = {
+                'sample_index': self._system_samples.count - 1,
+                't_ns': time.monotonic_ns() - self._start_mono_ns,
+                'cpu_percent': cpu_percent, 'mem_usage': mem_usage, 'mem_limit': mem_limit,
+                'network': network, 'blkio': blkio
+            }
+            self._container_samples.append(**container)
+
+        if self._sample_queue is not None:
+            self._put_sample((system, container))
 
-        return sample
+        if container is None:
+            return system['cpu_percent'], system['mem_percent'], None, None
+        return (system['cpu_percent'], system['mem_percent'], container['cpu_percent'],
+                container_memory_percent(container['mem_usage'], container['mem_limit']))
 
     def calculate_summary(self):
         """Calculate summary statistics from collected samples."""
-        if not self.metrics['samples']:
+        system = self._system_samples
+        if not system.count:
             return {}
 
-        # Extract values for statistical analysis
-        cpu_values = [s['system']['cpu']['percent'] for s in self.metrics['samples']]
-        memory_values = [s['system']['memory']['percent'] for s in self.metrics['samples']]
-
         summary = {
             'system': {
-                'cpu': {
-                    'min': min(cpu_values),
-                    'max': max(cpu_values),
-                    'avg': sum(cpu_values) / len(cpu_values),
-                    'median': sorted(cpu_values)[len(cpu_values) // 2]
-                },
-                'memory': {
-                    'min': min(memory_values),
-                    'max': max(memory_values),
-                    'avg': sum(memory_values) / len(memory_values),
-                    'median': sorted(memory_values)[len(memory_values) // 2]
-                }
+                'cpu': series_summary(system['cpu_percent']),
+                'memory': series_summary(system['mem_percent'])
             },
-            'total_samples': len(self.metrics['samples']),
+            'total_samples': system.count,
+            'missed_intervals': self._missed,
             'duration_seconds': (self.metrics['end_time'] - self.metrics['start_time']).total_seconds() if self.metrics['end_time'] else 0
         }
 
-        # Container-specific summary
-        if self.container and 'container' in self.metrics['samples'][0]:
-            container_cpu = [s['container']['cpu_percent'] for s in self.metrics['samples'] if 'container' in s]
-            container_mem = [s['container']['memory']['percent'] for s in self.metrics['samples'] if 'container' in s]
-
-            if container_cpu and container_mem:
-                summary['container'] = {
-                    'name': self.container_name,
-                    'cpu': {
-                        'min': min(container_cpu),
-                        'max': max(container_cpu),
-                        'avg': sum(container_cpu) / len(container_cpu),
-                        'median': sorted(container_cpu)[len(container_cpu) // 2]
-                    },
-                    'memory': {
-                        'min': min(container_mem),
-                        'max': max(container_mem),
-                        'avg': sum(container_mem) / len(container_mem),
-                        'median': sorted(container_mem)[len(container_mem) // 2]
-                    }
-                }
+        # Container-specific summary (streamed stats may miss the first samples)
+        container = self._container_samples
+        if self.container and container.count:
+            summary['container'] = {
+                'name': self.container_name,
+                'cpu': series_summary(container['cpu_percent']),
+                'memory': series_summary(
+                    container_memory_percent(container['mem_usage'], container['mem_limit']))
+            }
 
         return summary
 
+    def _wall_time(self, t_ns):
+        """ISO wall-clock time of a sample's monotonic offset."""
+        return (self._start_wall + timedelta(microseconds=t_ns // 1000)).isoformat()
+
+    def _system_sample(self, row):
+        """Nested results-file form of one system row."""
+        return {
+            'timestamp': self._wall_time(row['t_ns']),
+            'cpu': {
+                'percent': row['cpu_percent'],
+                'count': self._cpu_count,
+                'per_cpu': row['per_cpu']
+            },
+            'memory': {
+                'total': row['mem_total'],
+                'available': row['mem_available'],
+                'used': row['mem_used'],
+                'percent': row['mem_percent'],
+                'free': row['mem_free']
+            },
+            'disk': {
+                'total': row['disk_total'],
+                'used': row['disk_used'],
+                'free': row['disk_free'],
+                'percent': row['disk_percent']
+            },
+            'network': {
+                'bytes_sent': row['bytes_sent'],
+                'bytes_recv': row['bytes_recv'],
+                'packets_sent': row['packets_sent'],
+                'packets_recv': row['packets_recv']
+            }
+        }
+
+    def _container_sample(self, row):
+        """Nested results-file form of one container row."""
+        usage = row['mem_usage']
+        limit = row['mem_limit']
+        return {
+            'timestamp': self._wall_time(row['t_ns']),
+            'container_name': self.container_name,
+            'cpu_percent': row['cpu_percent'],
+            'memory': {
+                'usage': usage,
+                'limit': limit,
+                'percent': container_memory_percent(usage, limit),
+                'usage_mb': usage / (1024 * 1024),
+                'limit_mb': limit / (1024 * 1024)
+            },
+            'network': row['network'],
+            'blkio': row['blkio']
+        }
+
+    @staticmethod
+    def _rows(columns):
+        """Iterate a SampleColumns table as dicts of Python values."""
+        lists = {name: columns[name].tolist() for name in columns.names()}
+        return (dict(zip(lists, values)) for values in zip(*lists.values()))
+
+    def build_samples(self):
+        """Rebuild the per-sample nested dicts saved in the results file."""
+        samples = [{'system': self._system_sample(row)}
+                   for row in self._rows(self._system_samples)]
+        for row in self._rows(self._container_samples):
+            samples[row['sample_index']]['container'] = self._container_sample(row)
+        return samples
+
+    def _write_samples(self):
+        """Drain queued sample rows into the samples file as NDJSON (runs in a thread).
+
+        An error (disk full, unserializable value) is kept for the monitor
+        thread to re-raise, since nothing drains the queue once this exits.
+        """
+        try:
+            self._write_samples_file()
+        except Exception as e:
+            self._sample_writer_error = e
+
+    def _write_samples_file(self):
+        """Write queued samples to the file until the None sentinel arrives."""
+        encode = orjson.dumps if ORJSON_AVAILABLE else lambda obj: json.dumps(obj).encode('utf-8')
+
+        def dumps(rows):
+            system, container = rows
+            sample = {'system': self._system_sample(system)}
+            if container:
+                sample['container'] = self._container_sample(container)
+            return encode(sample)
+
+        with open_output(self.samples_file) as f:
+            done = False
+            while not done:
+                sample = self._sample_queue.get()
+                if sample is None:
+                    break
+                batch = [dumps(sample)]
+                deadline = time.monotonic() + SAMPLE_FLUSH_INTERVAL
+                try:
+                    while len(batch) < SAMPLE_BATCH_SIZE:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        sample = self._sample_queue.get(timeout=remaining)
+                        if sample is None:
+                            done = True
+                            break
+                        batch.append(dumps(sample))
+                except queue.Empty:
+                    pass
+                batch.append(b'')
+                f.write(b'\n'.join(batch))
+
+    def _start_sample_writer(self):
+        """Create the sample queue and start the samples-file writer thread."""
+        directory = os.path.dirname(self.samples_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._sample_queue = queue.Queue(maxsize=SAMPLE_QUEUE_SIZE)
+        self._sample_writer = threading.Thread(target=self._write_samples,
+                                               name='sample-writer', daemon=True)
+        self._sample_writer.start()
+
+    def _put_sample(self, item):
+        """Queue an item for the writer, failing instead of blocking if it has died."""
+        while True:
+            if not self._sample_writer.is_alive():
+                self._raise_writer_error()
+            try:
+                self._sample_queue.put(item, timeout=SAMPLE_PUT_TIMEOUT)
+                return
+            except queue.Full:
+                pass
+
+    def _raise_writer_error(self):
+        """Stop queueing samples and re-raise why the writer exited."""
+        error = self._sample_writer_error
+        self._sample_writer = None
+        self._sample_queue = None
+        raise RuntimeError(f"Samples writer for {self.samples_file} stopped") from error
+
+    def _stop_sample_writer(self):
+        """Flush the remaining samples and wait for the writer to close the file."""
+        if self._sample_writer:
+            self._put_sample(None)
+            self._sample_writer.join()
+            if self._sample_writer_error is not None:
+                self._raise_writer_error()
+            self._sample_writer = None
+            self._sample_queue = None
+
     def monitor(self, duration=None):
         """
         Monitor resources for a specified duration or until interrupted.
@@ -210,55 +677,100 @@ class ResourceMonitor:
         if self.container:
             print(f"Monitoring Docker container: {self.container_name}")
 
-        start_time = time.time()
+        start_time = time.monotonic()
         sample_count = 0
+        if self.samples_file:
+            self._start_sample_writer()
+            print(f"Streaming samples to {self.samples_file}")
+        elif duration:
+            # Preallocate the sample columns for the whole run
+            capacity = int(duration / self.interval) + 16
+            self._system_samples.reserve(capacity)
+            if self.container:
+                self._container_samples.reserve(capacity)
+
+        # Absolute deadlines keep the cadence fixed however long a sample
+        # takes; ticks that pass while a sample is still being collected are
+        # counted as missed instead of silently stretching the interval
+        deadline = start_time
+        self._missed = 0
 
         try:
             while True:
-                if duration and (time.time() - start_time) >= duration:
+                if duration and (time.monotonic() - start_time) >= duration:
                     break
 
-                sample = self.collect_sample()
-                self.metrics['samples'].append(sample)
+                cpu, mem, cont_cpu, cont_mem = self.collect_sample()
                 sample_count += 1
 
                 # Print live stats
-                cpu = sample['system']['cpu']['percent']
-                mem = sample['system']['memory']['percent']
-
                 status = f"Sample {sample_count}: CPU: {cpu:.1f}% | Memory: {mem:.1f}%"
 
-                if 'container' in sample and sample['container']:
-                    cont_cpu = sample['container']['cpu_percent']
-                    cont_mem = sample['container']['memory']['percent']
+                if cont_cpu is not None:
                     status += f" | Container CPU: {cont_cpu:.1f}% | Container Memory: {cont_mem:.1f}%"
 
                 print(status)
 
-                time.sleep(self.interval)
+                deadline += self.interval
+                now = time.monotonic()
+                if deadline <= now:
+                    # Overran: skip the ticks already past rather than firing
+                    # back-to-back samples to catch up
+                    missed = int((now - deadline) // self.interval) + 1
+                    self._missed += missed
+                    deadline += missed * self.interval
+                time.sleep(deadline - now)
 
         except KeyboardInterrupt:
             print("\nMonitoring stopped by user")
 
         self.metrics['end_time'] = datetime.now()
+        self._stop_sample_writer()
+        self.close()
         self.metrics['summary'] = self.calculate_summary()
 
-        print(f"\nCollected {len(self.metrics['samples'])} samples")
+        print(f"\nCollected {self._system_samples.count} samples")
         return self.metrics
 
+    def close(self):
+        """Stop the container stats stream and release the Docker connection."""
+        if self._closed:
+            return
+        self._closed = True
+        self._close_cgroup_files()
+        if self._proc_fds:
+            for fd in self._proc_fds:
+                os.close(fd)
+            self._proc_fds = None
+        if self.docker_client:
+            # Closing the client's session ends the streaming response the
+            # reader thread is blocked on
+            self.docker_client.close()
+
     def save_results(self, output_file):
         """Save metrics to JSON file."""
         os.makedirs(os.path.dirname(output_file), exist_ok=True)
 
-        # Convert datetime objects to strings
-        save_data = self.metrics.copy()
-        if save_data['start_time']:
-            save_data['start_time'] = save_data['start_time'].isoformat()
-        if save_data['end_time']:
-            save_data['end_time'] = save_data['end_time'].isoformat()
-
-        with open(output_file, 'w') as f:
-            json.dump(save_data, f, indent=2)
+        # Convert datetime objects to strings and expand the stored samples
+        start_time = self.metrics['start_time']
+        end_time = self.metrics['end_time']
+        save_data = {
+            'start_time': start_time.isoformat() if start_time else None,
+            'end_time': end_time.isoformat() if end_time else None,
+            'interval': self.metrics['interval']
+        }
+        if self.samples_file:
+            save_data['samples_file'] = self.samples_file
+        else:
+            save_data['samples'] = self.build_samples()
+        save_data['summary'] = self.metrics['summary']
+
+        if ORJSON_AVAILABLE:
+            payload = orjson.dumps(save_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+        else:
+            payload = json.dumps(save_data, indent=2).encode('utf-8')
+        with open_output(output_file) as f:
+            f.write(payload)
 
         print(f"Results saved to {output_file}")
 
@@ -292,6 +804,7 @@ class ResourceMonitor:
 
             print(f"\nDuration: {summary['duration_seconds']:.2f} seconds")
             print(f"Total Samples: {summary['total_samples']}")
+            print(f"Missed Intervals: {summary['missed_intervals']}")
             print("="*80 + "\n")
 
 
@@ -304,8 +817,12 @@ def main():
                        help='Monitoring duration in seconds (default: until interrupted)')
     parser.add_argument('--container', type=str, default=None,
                        help='Docker container name to monitor')
+    parser.add_argument('--samples-file', type=str, default=None,
+                       help='Stream samples to this NDJSON file (gzipped if it ends in .gz) '
+                            'instead of keeping them in memory for --output')
     parser.add_argument('--output', type=str, default='test_results/resources.json',
-                       help='Output file for results (default: test_results/resources.json)')
+                       help='Output file for results, gzipped if it ends in .gz '
+                            '(default: test_results/resources.json)')
 
     args = parser.parse_args()
 
@@ -315,7 +832,8 @@ def main():
         print("Continuing with system-wide monitoring only...")
         args.container = None
 
-    monitor = ResourceMonitor(interval=args.interval, container_name=args.container)
+    monitor = ResourceMonitor(interval=args.interval, container_name=args.container,
+                              samples_file=args.samples_file)
 
     try:
         monitor.monitor(duration=args.duration)
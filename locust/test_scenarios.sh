@@ -366,7 +366,9 @@ Available Scenarios:
     help        - Show this help message
 
 Environment Variables:
-    HOST        - Target host (default: http://localhost:8080)
+    HOST                 - Target host (default: http://localhost:8080)
+    LOCUST_RESULTS_PLAIN - Write performance metrics as plain .json instead
+                           of gzip-compressed .json.gz (set to any value)
 
 Examples:
     ./test_scenarios.sh baseline
@@ -378,7 +380,8 @@ Results:
     - HTML reports: *_TIMESTAMP.html
     - CSV data: *_TIMESTAMP_stats.csv
     - Resource usage: resources_*_TIMESTAMP.json
-    - Performance metrics: performance_results_*.json
+    - Performance metrics: performance_results_*.json.gz
+      (performance_results_*.json with LOCUST_RESULTS_PLAIN set)
 
 EOF
 }
@@ -0,0 +1,12 @@
+"""
+Shared helpers for route tests.
+"""
+
+# Requests carrying this header get an empty body instead of a rendered template
+SKIP_RENDER_HEADER = 'X-Skip-Render'
+
+
+def status_only(client, url, **kwargs):
+    """GET a page without rendering its template, for status-only checks."""
+    headers = {**kwargs.pop('headers', {}), SKIP_RENDER_HEADER: '1'}
+    return client.get(url, headers=headers, **kwargs)
@@ -2,15 +2,54 @@
 Pytest configuration and fixtures for Chess Tournament Management System tests.
 """
 import os
+import functools
 import pytest
 import mysql.connector
 from mysql.connector import Error
+from mysql.connector.errors import PoolError
+from mysql.connector.pooling import MySQLConnectionPool
 
-# Set testing environment before importing app
+# Set testing environment before the fixtures import app
 os.environ['FLASK_ENV'] = 'testing'
-os.environ['DB_NAME'] = 'chessdb_test'
+# One database per pytest-xdist worker (gw0, gw1, ...) so workers never share rows.
+# TestingConfig reads TEST_DB_NAME; DB_NAME covers everything else.
+TEST_DB_NAME = (
+    f"chessdb_test_{os.environ['PYTEST_XDIST_WORKER']}"
+    if 'PYTEST_XDIST_WORKER' in os.environ else 'chessdb_test'
+)
+os.environ['DB_NAME'] = TEST_DB_NAME
+os.environ['TEST_DB_NAME'] = TEST_DB_NAME
+
+from tests._helpers import SKIP_RENDER_HEADER
+
+SCHEMA_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)),
+    'code', 'triggers.sql'
+)
+
+
+@functools.lru_cache(maxsize=None)
+def load_schema(schema_path=SCHEMA_PATH):
+    """Read and split the schema file once.
+
+    Returns (script, commands): the whole file as one multi-statement script,
+    and the $$-separated commands for statement-at-a-time fallback.
+    DELIMITER is a mysql CLI directive rather than SQL (the server parses
+    BEGIN ... END bodies itself), so the script drops those lines and ends
+    each $$-terminated block with a plain ';'.
+    """
+    with open(schema_path, 'r') as f:
+        sql_content = f.read()
 
-from app import app, get_db_connection, User
+    commands = tuple(
+        command.strip() for command in sql_content.split('$$')
+        if command.strip() and not command.strip().startswith('DELIMITER')
+    )
+    script = '\n'.join(
+        line for line in sql_content.splitlines()
+        if not line.lstrip().upper().startswith('DELIMITER')
+    ).replace('$$', ';')
+    return script, commands
 
 
 @pytest.fixture(scope='session')
@@ -32,31 +71,27 @@ def setup_test_database(test_db_config):
     cursor = conn.cursor()
 
     # Create test database
-    cursor.execute("DROP DATABASE IF EXISTS chessdb_test")
-    cursor.execute("CREATE DATABASE chessdb_test")
-    cursor.execute("USE chessdb_test")
-
-    # Read and execute schema from triggers.sql
-    schema_path = os.path.join(
-        os.path.dirname(os.path.dirname(__file__)),
-        'code', 'triggers.sql'
-    )
-
-    with open(schema_path, 'r') as f:
-        sql_content = f.read()
-
-    # Split by delimiter and execute each command
-    commands = sql_content.split('$$')
-    for command in commands:
-        command = command.strip()
-        if command and not command.startswith('DELIMITER'):
+    cursor.execute(f"DROP DATABASE IF EXISTS {TEST_DB_NAME}")
+    cursor.execute(f"CREATE DATABASE {TEST_DB_NAME}")
+    cursor.execute(f"USE {TEST_DB_NAME}")
+
+    # Execute the schema from triggers.sql in one multi-statement round trip
+    script, commands = load_schema()
+    try:
+        for result in cursor.execute(script, multi=True):
+            if result.with_rows:
+                result.fetchall()
+    except Error:
+        # Fall back to executing each command, skipping failures
+        # (DROP IF EXISTS, objects created before the multi-statement error)
+        cursor.close()
+        cursor = conn.cursor()
+        for command in commands:
             try:
                 cursor.execute(command)
-                conn.commit()
-            except Error as e:
-                # Skip errors for DROP IF EXISTS, etc.
-                if 'already exists' not in str(e).lower():
-                    pass
+            except Error:
+                pass
+    conn.commit()
 
     cursor.close()
     conn.close()
@@ -66,152 +101,269 @@ def setup_test_database(test_db_config):
     # Cleanup after all tests
     conn = mysql.connector.connect(**test_db_config)
     cursor = conn.cursor()
-    cursor.execute("DROP DATABASE IF EXISTS chessdb_test")
+    cursor.execute(f"DROP DATABASE IF EXISTS {TEST_DB_NAME}")
     cursor.close()
     conn.close()
 
 
+@pytest.fixture(scope='session')
+def db_pool(setup_test_database, test_db_config):
+    """Connection pool shared by the whole test session."""
+    return MySQLConnectionPool(
+        pool_name='test', pool_size=4,
+        **test_db_config, database=TEST_DB_NAME
+    )
+
+
 @pytest.fixture(scope='function')
-def test_db(setup_test_database, test_db_config):
-    """Provide a database connection for each test."""
-    config = {**test_db_config, 'database': 'chessdb_test'}
-    conn = mysql.connector.connect(**config)
+def test_db(db_pool):
+    """Provide a pooled database connection for each test."""
+    conn = db_pool.get_connection()
     cursor = conn.cursor(dictionary=True)
 
     yield conn, cursor
 
-    # Rollback any uncommitted changes
+    # Rollback any uncommitted changes and return the connection to the pool
     conn.rollback()
     cursor.close()
     conn.close()
 
 
-@pytest.fixture(scope='function')
-def seed_test_data(test_db):
-    """Seed basic test data for each test."""
-    conn, cursor = test_db
+# Tables cleared before seeding, in foreign-key order
+SEED_CLEAR_TABLES = (
+    'match_assignments', 'matches', 'player_teams', 'match_tables',
+    'coach_certifications', 'coaches', 'teams', 'sponsors',
+    'players', 'title', 'arbiter_certifications', 'arbiters',
+    'managers', 'users', 'halls'
+)
 
-    # Clear existing data (in correct order for foreign keys)
-    tables = [
-        'match_assignments', 'matches', 'player_teams', 'match_tables',
-        'coach_certifications', 'coaches', 'teams', 'sponsors',
-        'players', 'title', 'arbiter_certifications', 'arbiters',
-        'managers', 'users', 'halls'
-    ]
-    for table in tables:
-        try:
-            cursor.execute(f"DELETE FROM {table}")
-        except Error:
-            pass
-
-    conn.commit()
-
-    # Insert test users
-    cursor.execute("""
-        INSERT INTO users (username, password, role) VALUES
+# (table, columns, rows) in insertion order; titles and sponsors come before
+# the players and teams that reference them
+SEED_DATA = (
+    ('users', ('username', 'password', 'role'), (
         ('test_manager', 'password123', 'manager'),
         ('test_player', 'password123', 'player'),
         ('test_coach', 'password123', 'coach'),
-        ('test_arbiter', 'password123', 'arbiter')
-    """)
-
-    # Insert manager
-    cursor.execute("""
-        INSERT INTO managers (username, password) VALUES
-        ('test_manager', 'password123')
-    """)
-
-    # Insert title (required for players)
-    cursor.execute("""
-        INSERT INTO title (title_id, title_name) VALUES
+        ('test_arbiter', 'password123', 'arbiter'),
+    )),
+    ('managers', ('username', 'password'), (
+        ('test_manager', 'password123'),
+    )),
+    ('title', ('title_id', 'title_name'), (
         (1, 'Grandmaster'),
-        (2, 'International Master')
-    """)
-
-    # Insert sponsor (required for teams)
-    cursor.execute("""
-        INSERT INTO sponsors (sponsor_id, sponsor_name) VALUES
-        (1, 'Test Sponsor')
-    """)
-
-    # Insert teams
-    cursor.execute("""
-        INSERT INTO teams (team_id, team_name, sponsor_id) VALUES
+        (2, 'International Master'),
+    )),
+    ('sponsors', ('sponsor_id', 'sponsor_name'), (
+        (1, 'Test Sponsor'),
+    )),
+    ('teams', ('team_id', 'team_name', 'sponsor_id'), (
         (1, 'Test Team 1', 1),
-        (2, 'Test Team 2', 1)
-    """)
-
-    # Insert halls
-    cursor.execute("""
-        INSERT INTO halls (hall_id, hall_name, hall_country, hall_capacity) VALUES
-        (1, 'Test Hall', 'USA', 10)
-    """)
-
-    # Insert match tables
-    cursor.execute("""
-        INSERT INTO match_tables (table_id, hall_id) VALUES
+        (2, 'Test Team 2', 1),
+    )),
+    ('halls', ('hall_id', 'hall_name', 'hall_country', 'hall_capacity'), (
+        (1, 'Test Hall', 'USA', 10),
+    )),
+    ('match_tables', ('table_id', 'hall_id'), (
         (1, 1),
-        (2, 1)
-    """)
-
-    # Insert arbiter with certification
-    cursor.execute("""
-        INSERT INTO arbiters (username, password, name, surname, nationality, experience_level)
-        VALUES ('test_arbiter', 'password123', 'Test', 'Arbiter', 'USA', 'advanced')
-    """)
-    cursor.execute("""
-        INSERT INTO arbiter_certifications (username, certification)
-        VALUES ('test_arbiter', 'FIDE Certified')
-    """)
-
-    # Insert player
-    cursor.execute("""
-        INSERT INTO players (username, password, name, surname, nationality,
-                           dateofbirth, elorating, fideid, titleid, team_list)
-        VALUES ('test_player', 'password123', 'Test', 'Player', 'USA',
-                '2000-01-01', 2000, 'FIDE001', 1, '')
-    """)
-
-    # Add player to team
-    cursor.execute("""
-        INSERT INTO player_teams (username, team_id) VALUES
-        ('test_player', 1)
-    """)
-
-    # Insert coach
-    cursor.execute("""
-        INSERT INTO coaches (username, password, name, surname, nationality,
-                           team_id, contract_start, contract_finish)
-        VALUES ('test_coach', 'password123', 'Test', 'Coach', 'USA',
-                1, '2024-01-01', '2026-01-01')
-    """)
+        (2, 1),
+    )),
+    ('arbiters', ('username', 'password', 'name', 'surname', 'nationality',
+                  'experience_level'), (
+        ('test_arbiter', 'password123', 'Test', 'Arbiter', 'USA', 'advanced'),
+    )),
+    ('arbiter_certifications', ('username', 'certification'), (
+        ('test_arbiter', 'FIDE Certified'),
+    )),
+    ('players', ('username', 'password', 'name', 'surname', 'nationality',
+                 'dateofbirth', 'elorating', 'fideid', 'titleid', 'team_list'), (
+        ('test_player', 'password123', 'Test', 'Player', 'USA',
+         '2000-01-01', 2000, 'FIDE001', 1, ''),
+    )),
+    ('player_teams', ('username', 'team_id'), (
+        ('test_player', 1),
+    )),
+    ('coaches', ('username', 'password', 'name', 'surname', 'nationality',
+                 'team_id', 'contract_start', 'contract_finish'), (
+        ('test_coach', 'password123', 'Test', 'Coach', 'USA',
+         1, '2024-01-01', '2026-01-01'),
+    )),
+)
+
+# INSERT statements built once at import
+SEED_INSERTS = tuple(
+    (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join(['%s'] * len(columns))})",
+        rows
+    )
+    for table, columns, rows in SEED_DATA
+)
+
+
+def _seed_once(conn, cursor):
+    """Clear the tables and insert the basic test data."""
+    for table in SEED_CLEAR_TABLES:
+        try:
+            cursor.execute(f"DELETE FROM {table}")
+        except Error:
+            pass
 
     conn.commit()
 
+    # Static inserts go through a prepared cursor: parsed once, bound per row
+    pcur = conn.cursor(prepared=True)
+    for statement, rows in SEED_INSERTS:
+        pcur.executemany(statement, rows)
+    pcur.close()
+    conn.commit()
+
+
+@pytest.fixture(scope='session')
+def seeded_database(db_pool):
+    """Seed basic test data once per test session."""
+    conn = db_pool.get_connection()
+    cursor = conn.cursor(dictionary=True)
+    _seed_once(conn, cursor)
+    cursor.close()
+    conn.close()
+
+
+@pytest.fixture(scope='function')
+def seed_test_data(seeded_database, test_db):
+    """Wrap each test in a savepoint over the session's seed data.
+
+    Only writes made through the test's connection are rolled back; views
+    commit on the app's own pooled connections, so tests that write through
+    the app are marked mutates_db and reseeded by _reseed_after_mutation.
+    """
+    conn, cursor = test_db
+    cursor.execute("SAVEPOINT test_sp")
+
     yield
 
-    # Cleanup is handled by test_db fixture rollback
+    cursor.execute("ROLLBACK TO SAVEPOINT test_sp")
 
 
-@pytest.fixture
-def flask_app():
-    """Create Flask application for testing."""
+@pytest.fixture(autouse=True)
+def _reseed_after_mutation(request):
+    """Reload the seed data after a test marked mutates_db.
+
+    Keeps the app's committed writes from leaking into later tests, whatever
+    order they run in or however xdist splits the files.
+    """
+    if request.node.get_closest_marker('mutates_db') is None:
+        yield
+        return
+
+    db_pool = request.getfixturevalue('db_pool')
+    request.getfixturevalue('seeded_database')
+
+    yield
+
+    conn = db_pool.get_connection()
+    cursor = conn.cursor(dictionary=True)
+    _seed_once(conn, cursor)
+    cursor.close()
+    conn.close()
+
+
+@pytest.fixture(scope='session')
+def app_db_pool(setup_test_database, test_db_config):
+    """Serve the app's get_db_connection() from a session-wide pool.
+
+    Views close their connection when done, which returns it to the pool;
+    a fresh connection is opened only if every pooled one is checked out.
+    """
+    # app (Flask, caching, audit batcher) is imported only once a test needs it
+    import app as app_module
+
+    pool = MySQLConnectionPool(
+        pool_name='app', pool_size=8,
+        **test_db_config, database=TEST_DB_NAME
+    )
+
+    original_get_db_connection = app_module.get_db_connection
+
+    def pooled_db_connection():
+        try:
+            return pool.get_connection()
+        except PoolError:
+            return original_get_db_connection()
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(app_module, 'get_db_connection', pooled_db_connection)
+        yield pool
+
+
+@pytest.fixture(scope='session')
+def flask_app(app_db_pool):
+    """Configure the Flask application for testing once per session."""
+    from flask import render_template, request
+    import app as app_module
+    app = app_module.app
+
     app.config['TESTING'] = True
     app.config['WTF_CSRF_ENABLED'] = False
-    return app
+    app.config['TEMPLATES_AUTO_RELOAD'] = False
+    # Compile every template up front; with auto-reload off they stay cached
+    app.jinja_env.auto_reload = False
+    for name in app.jinja_env.list_templates(extensions=['html']):
+        app.jinja_env.get_template(name)
+
+    def render_unless_skipped(template_name_or_list, **context):
+        # Status-only tests (see _helpers.status_only) don't need the HTML
+        if request.headers.get(SKIP_RENDER_HEADER):
+            return ''
+        return render_template(template_name_or_list, **context)
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(app_module, 'render_template', render_unless_skipped)
+        yield app
 
 
 @pytest.fixture
 def client(flask_app, setup_test_database, seed_test_data):
-    """Create a test client for the Flask app."""
-    with flask_app.test_client() as client:
-        yield client
+    """Create a test client for the Flask app.
+
+    Used without 'with': no test inspects request globals after a call, so
+    there is no need to keep each request's context alive until the next.
+    """
+    return flask_app.test_client(use_cookies=True)
+
+
+TEST_USERS = ('test_manager', 'test_player', 'test_coach', 'test_arbiter')
+
+
+@pytest.fixture(scope='session')
+def _role_cookies(flask_app, seeded_database):
+    """Log each seeded user in once and keep their session cookie values."""
+    cookie_name = flask_app.config['SESSION_COOKIE_NAME']
+    cookies = {}
+    for username in TEST_USERS:
+        login_client = flask_app.test_client()
+        login_client.post('/login', data={
+            'username': username,
+            'password': 'password123'
+        })
+        cookie = login_client.get_cookie(cookie_name)
+        if cookie is not None:
+            cookies[username] = cookie.value
+    return cookies
 
 
 @pytest.fixture
-def logged_in_client(client):
-    """Factory fixture to create logged-in test clients for different roles."""
+def logged_in_client(client, flask_app, _role_cookies):
+    """Factory fixture to create logged-in test clients for different roles.
+
+    Seeded users get their cached session cookie instead of a login POST.
+    """
     def _login(username, password='password123'):
+        if password == 'password123' and username in _role_cookies:
+            client.set_cookie(
+                flask_app.config['SESSION_COOKIE_NAME'],
+                _role_cookies[username]
+            )
+            return client
         client.post('/login', data={
             'username': username,
             'password': password
@@ -220,25 +372,95 @@ def logged_in_client(client):
     return _login
 
 
-@pytest.fixture
-def manager_client(logged_in_client):
-    """Test client logged in as manager."""
-    return logged_in_client('test_manager')
+def _role_client(flask_app, role_cookies, username):
+    """New test client carrying the seeded user's cached session cookie."""
+    role_client = flask_app.test_client()
+    if username in role_cookies:
+        role_client.set_cookie(
+            flask_app.config['SESSION_COOKIE_NAME'],
+            role_cookies[username]
+        )
+    else:
+        role_client.post('/login', data={
+            'username': username,
+            'password': 'password123'
+        }, follow_redirects=True)
+    return role_client
 
 
-@pytest.fixture
-def player_client(logged_in_client):
-    """Test client logged in as player."""
-    return logged_in_client('test_player')
+@pytest.fixture(scope='session')
+def role_clients(flask_app, _role_cookies):
+    """One persistent logged-in test client per role, keyed by role name."""
+    return {
+        username[len('test_'):]: _role_client(flask_app, _role_cookies, username)
+        for username in TEST_USERS
+    }
+
+
+@pytest.fixture(scope='class')
+def class_get(flask_app, _role_cookies):
+    """Memoized GETs shared by one test class: class_get(username, url).
+
+    Each (username, url) is requested once per class with the user's cached
+    session cookie; tests then assert on the same Response.
+    """
+    responses = {}
+
+    def _get(username, url):
+        key = (username, url)
+        if key not in responses:
+            role_client = _role_client(flask_app, _role_cookies, username)
+            responses[key] = role_client.get(url)
+        return responses[key]
+    return _get
 
 
 @pytest.fixture
-def coach_client(logged_in_client):
-    """Test client logged in as coach."""
-    return logged_in_client('test_coach')
+def assert_access_denied():
+    """Check that a role-guarded view refused the request.
+
+    Denied views flash 'Access denied' and redirect to index, so the check
+    reads the 302 and the flashed message instead of rendering the target.
+    The messages are consumed, so a client shared across tests only ever
+    shows the current request's flashes.
+    """
+    def _check(client, response):
+        assert response.status_code == 302
+        assert response.headers['Location'] == '/'
+        with client.session_transaction() as session:
+            messages = [message for _, message in session.pop('_flashes', [])]
+        assert any('Access denied' in message for message in messages)
+    return _check
 
 
 @pytest.fixture
-def arbiter_client(logged_in_client):
-    """Test client logged in as arbiter."""
-    return logged_in_client('test_arbiter')
+def assert_redirects_to_login():
+    """Check that login_required sent an anonymous request to the login page."""
+    def _check(response):
+        assert response.status_code == 302
+        assert response.headers['Location'].startswith('/login')
+    return _check
+
+
+@pytest.fixture(scope='class')
+def manager_client(flask_app, _role_cookies):
+    """Test client logged in as manager, shared by the test class."""
+    return _role_client(flask_app, _role_cookies, 'test_manager')
+
+
+@pytest.fixture(scope='class')
+def player_client(flask_app, _role_cookies):
+    """Test client logged in as player, shared by the test class."""
+    return _role_client(flask_app, _role_cookies, 'test_player')
+
+
+@pytest.fixture(scope='class')
+def coach_client(flask_app, _role_cookies):
+    """Test client logged in as coach, shared by the test class."""
+    return _role_client(flask_app, _role_cookies, 'test_coach')
+
+
+@pytest.fixture(scope='class')
+def arbiter_client(flask_app, _role_cookies):
+    """Test client logged in as arbiter, shared by the test class."""
+    return _role_client(flask_app, _role_cookies, 'test_arbiter')
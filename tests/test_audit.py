@@ -0,0 +1,127 @@
+"""
+Tests for the audit event batcher.
+"""
+import threading
+import pytest
+
+import audit
+from audit import AuditBatcher
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class FakePost:
+    """Stand-in for requests.post that records each batch and replays statuses."""
+
+    def __init__(self, responses=()):
+        self.responses = list(responses)
+        self.batches = []
+        self.called = threading.Event()
+
+    def __call__(self, url, json=None, timeout=None):
+        self.batches.append(json['events'])
+        self.called.set()
+        if self.responses:
+            return self.responses.pop(0)
+        return FakeResponse(202)
+
+
+class FakeLogger:
+    def __init__(self):
+        self.warnings = []
+
+    def warning(self, message):
+        self.warnings.append(message)
+
+
+@pytest.fixture
+def fake_post(monkeypatch):
+    post = FakePost()
+    monkeypatch.setattr(audit.requests, 'post', post)
+    return post
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    waits = []
+    monkeypatch.setattr(audit.time, 'sleep', waits.append)
+    return waits
+
+
+def make_batcher(**kwargs):
+    return AuditBatcher('https://audit.example/fn', FakeLogger(), **kwargs)
+
+
+class TestBatching:
+    def test_full_batch_is_sent_without_waiting_for_timer(self, fake_post):
+        batcher = make_batcher(batch_size=3, flush_interval=60)
+        for i in range(3):
+            batcher.enqueue({'event_type': 'login', 'n': i})
+
+        assert fake_post.called.wait(5)
+        assert fake_post.batches == [[{'event_type': 'login', 'n': i} for i in range(3)]]
+        batcher.close()
+
+    def test_partial_batch_is_sent_after_flush_interval(self, fake_post):
+        batcher = make_batcher(batch_size=100, flush_interval=0.05)
+        batcher.enqueue({'event_type': 'login'})
+        batcher.enqueue({'event_type': 'logout'})
+
+        assert fake_post.called.wait(5)
+        assert fake_post.batches == [[{'event_type': 'login'}, {'event_type': 'logout'}]]
+        batcher.close()
+
+    def test_close_sends_pending_events(self, fake_post):
+        batcher = make_batcher(batch_size=2, flush_interval=60)
+        for i in range(5):
+            batcher.enqueue({'event_type': 'login', 'n': i})
+
+        batcher.close()
+
+        sent = [event['n'] for batch in fake_post.batches for event in batch]
+        assert sent == list(range(5))
+        assert all(len(batch) <= 2 for batch in fake_post.batches)
+
+    def test_no_url_disables_batcher(self, fake_post):
+        batcher = AuditBatcher(None, FakeLogger())
+        batcher.enqueue({'event_type': 'login'})
+        batcher.close()
+
+        assert batcher._thread is None
+        assert fake_post.batches == []
+
+
+class TestSend:
+    def test_429_is_retried_after_retry_after(self, fake_post, sleeps):
+        fake_post.responses = [FakeResponse(429, {'Retry-After': '3'}), FakeResponse(202)]
+        batcher = make_batcher()
+
+        batcher._send([{'event_type': 'login'}])
+
+        assert len(fake_post.batches) == 2
+        assert sleeps == [3.0]
+        assert batcher.logger.warnings == []
+
+    def test_429_backoff_doubles_then_drops_batch(self, fake_post, sleeps):
+        fake_post.responses = [FakeResponse(429)] * 4
+        batcher = make_batcher(max_attempts=4, retry_delay=0.5)
+
+        batcher._send([{'event_type': 'login'}])
+
+        assert len(fake_post.batches) == 4
+        assert sleeps == [0.5, 1.0, 2.0]
+        assert 'Dropped 1 audit log(s)' in batcher.logger.warnings[0]
+
+    def test_other_errors_are_logged_not_retried(self, fake_post, sleeps):
+        fake_post.responses = [FakeResponse(500)]
+        batcher = make_batcher()
+
+        batcher._send([{'event_type': 'login'}])
+
+        assert len(fake_post.batches) == 1
+        assert sleeps == []
+        assert 'HTTP 500' in batcher.logger.warnings[0]
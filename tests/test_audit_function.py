@@ -0,0 +1,186 @@
+"""
+Tests for the audit logging Cloud Function (cloud-function-http/main.py).
+"""
+import os
+import sys
+import threading
+import pytest
+import functions_framework
+from google.cloud import storage
+
+FUNCTION_SOURCE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'cloud-function-http', 'main.py'
+)
+
+
+class FakeBlob:
+    def __init__(self, bucket, path):
+        self.bucket = bucket
+        self.path = path
+        self.content_encoding = None
+
+    def upload_from_string(self, body, **kwargs):
+        self.bucket.uploads[self.path] = body
+
+
+class FakeBucket:
+    def __init__(self):
+        self.uploads = {}
+
+    def blob(self, path):
+        return FakeBlob(self, path)
+
+
+class FakeStorageClient:
+    """Replaces storage.Client, which needs GCP credentials at import time."""
+
+    def bucket(self, name):
+        return FakeBucket()
+
+
+@pytest.fixture(scope='module')
+def function_app():
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(storage, 'Client', FakeStorageClient)
+        app = functions_framework.create_app(target='audit_log', source=FUNCTION_SOURCE)
+    yield app, sys.modules['main']
+    sys.modules.pop('main', None)
+
+
+@pytest.fixture
+def function_client(function_app):
+    app, _ = function_app
+    return app.test_client()
+
+
+@pytest.fixture
+def function_module(function_app):
+    return function_app[1]
+
+
+class StoreRecorder(list):
+    """Replaces store_events, recording the batches the background writer hands it."""
+
+    def __init__(self):
+        super().__init__()
+        self.written = threading.Event()
+
+    def __call__(self, events):
+        self.append(events)
+        self.written.set()
+        return True, False
+
+
+@pytest.fixture
+def stored(function_module, monkeypatch):
+    recorder = StoreRecorder()
+    monkeypatch.setattr(function_module, 'store_events', recorder)
+    return recorder
+
+
+class TestAuditLogHandler:
+    def test_single_event_is_queued(self, function_client, stored):
+        resp = function_client.post('/', json={'event_type': 'login', 'username': 'alice'})
+
+        assert resp.status_code == 202
+        assert resp.get_json()['event_count'] == 1
+        assert stored.written.wait(5)
+        assert stored[0][0]['event_type'] == 'login'
+        assert stored[0][0]['username'] == 'alice'
+
+    def test_events_envelope_is_queued_as_one_batch(self, function_client, stored):
+        events = [{'event_type': 'login', 'username': f'user{i}'} for i in range(3)]
+        resp = function_client.post('/', json={'events': events})
+
+        assert resp.status_code == 202
+        assert resp.get_json()['event_count'] == 3
+        assert stored.written.wait(5)
+        assert [e['username'] for e in stored[0]] == ['user0', 'user1', 'user2']
+
+    def test_event_without_type_rejects_request(self, function_client, stored):
+        resp = function_client.post('/', json={'events': [{'event_type': 'login'}, {}]})
+
+        assert resp.status_code == 400
+        assert stored == []
+
+    def test_request_larger_than_queue_is_413(self, function_client, function_module,
+                                              stored, monkeypatch):
+        monkeypatch.setattr(function_module, 'AUDIT_QUEUE_SIZE', 2)
+        events = [{'event_type': 'login'}] * 3
+        resp = function_client.post('/', json={'events': events})
+
+        assert resp.status_code == 413
+        assert function_module._audit_queue.qsize() == 0
+
+    def test_full_queue_refuses_whole_request(self, function_client, function_module,
+                                              stored, monkeypatch):
+        monkeypatch.setattr(function_module, 'AUDIT_QUEUE_SIZE', 2)
+        monkeypatch.setattr(function_module, '_queued_events', 1)
+        events = [{'event_type': 'login'}] * 2
+        resp = function_client.post('/', json={'events': events})
+
+        assert resp.status_code == 429
+        assert resp.headers['Retry-After'] == '1'
+        assert resp.get_json()['accepted'] == 0
+        assert function_module._audit_queue.qsize() == 0
+        assert function_module._queued_events == 1
+
+
+class TestAdmit:
+    def test_batch_that_fits_exactly_is_admitted(self, function_module, monkeypatch):
+        monkeypatch.setattr(function_module, 'AUDIT_QUEUE_SIZE', 3)
+        monkeypatch.setattr(function_module, '_queued_events', 1)
+        monkeypatch.setattr(function_module, '_audit_queue', function_module.queue.Queue())
+
+        assert function_module._admit([{'n': 1}, {'n': 2}])
+        assert function_module._queued_events == 3
+        assert not function_module._admit([{'n': 3}])
+        assert function_module._audit_queue.qsize() == 2
+
+
+class FailingCreateCursor:
+    def __init__(self, error):
+        self.error = error
+        self.statements = []
+        self.closed = False
+
+    def execute(self, sql):
+        self.statements.append(' '.join(sql.split()))
+        if sql.lstrip().startswith('CREATE'):
+            raise self.error
+
+    def close(self):
+        self.closed = True
+
+
+class TestEnsureSchema:
+    def test_sql_notes_restored_when_create_fails(self, function_module, monkeypatch):
+        monkeypatch.setattr(function_module, '_schema_ready', False)
+        cursor = FailingCreateCursor(function_module.Error('denied'))
+        conn = type('FakeConn', (), {'cursor': lambda self: cursor})()
+
+        with pytest.raises(function_module.Error):
+            function_module.ensure_schema(conn)
+
+        assert cursor.statements[-1] == 'SET SESSION sql_notes = 1'
+        assert cursor.closed
+        assert not function_module._schema_ready
+
+
+class TestSerialization:
+    def test_integer_beyond_64_bits_is_serialized(self, function_module):
+        details = {'game_id': 2 ** 64, 'move': 'e4'}
+
+        assert function_module.dumps_json(details) == b'{"game_id":18446744073709551616,"move":"e4"}'
+        assert function_module.encode_details(details) == '{"game_id":18446744073709551616,"move":"e4"}'
+
+    def test_event_with_large_integer_is_stored_in_gcs(self, function_module):
+        event = {'event_type': 'match_created', 'details': {'game_id': 2 ** 64}}
+
+        assert function_module.store_in_gcs([event])
+
+        (body,) = function_module.audit_bucket.uploads.values()
+        assert function_module.gzip.decompress(body) == (
+            b'{"event_type":"match_created","details":{"game_id":18446744073709551616}}'
+        )
@@ -0,0 +1,35 @@
+"""
+Tests for role-based access control across all role-guarded routes.
+"""
+import pytest
+
+# (client role, HTTP method, route owned by a different role)
+MATRIX = [
+    ('player', 'get', '/manager/dashboard'),
+    ('coach', 'get', '/manager/halls'),
+    ('arbiter', 'get', '/manager/create_user'),
+    ('manager', 'get', '/player/dashboard'),
+    ('coach', 'get', '/player/matches'),
+    ('arbiter', 'get', '/player/statistics'),
+    ('manager', 'get', '/player/opponents'),
+    ('player', 'get', '/coach/dashboard'),
+    ('arbiter', 'get', '/coach/dashboard'),
+    ('manager', 'get', '/coach/matches/create'),
+    ('arbiter', 'get', '/coach/halls'),
+    ('player', 'post', '/coach/matches/1/delete'),
+    ('coach', 'get', '/arbiter/dashboard'),
+    ('player', 'get', '/arbiter/matches/1/rate'),
+    ('manager', 'get', '/arbiter/statistics'),
+]
+
+
+class TestAccessDenied:
+    """Tests that each role is refused routes owned by another role."""
+
+    @pytest.mark.parametrize('role,method,url', MATRIX)
+    def test_role_cannot_access_route(self, role_clients, role, method, url,
+                                      assert_access_denied):
+        """Test that the role is denied access to the route."""
+        role_client = role_clients[role]
+        response = getattr(role_client, method)(url, follow_redirects=False)
+        assert_access_denied(role_client, response)
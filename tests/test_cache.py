@@ -0,0 +1,133 @@
+"""
+Tests for the caching helpers.
+"""
+import fnmatch
+import pytest
+import redis
+
+from cache import CacheHelper
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the redis-py client used by clear_pattern."""
+
+    def __init__(self, keys, supports_unlink=True):
+        self.store = dict.fromkeys(keys, b'1')
+        self.supports_unlink = supports_unlink
+        self.batch_sizes = []
+
+    def scan_iter(self, match=None, count=None):
+        # Snapshot like a SCAN cursor walk, so deleting while iterating is safe
+        for key in list(self.store):
+            if match is None or fnmatch.fnmatchcase(key, match):
+                yield key
+
+    def unlink(self, *keys):
+        if not self.supports_unlink:
+            raise redis.exceptions.ResponseError("unknown command 'UNLINK'")
+        return self.delete(*keys)
+
+    def delete(self, *keys):
+        self.batch_sizes.append(len(keys))
+        return sum(self.store.pop(key, None) is not None for key in keys)
+
+
+class FakeBackend:
+    def __init__(self, client, key_prefix='chess_'):
+        self._write_client = client
+        self.key_prefix = key_prefix
+
+
+class FakeCache:
+    """Mimics flask_caching.Cache: operations plus the backend on .cache."""
+
+    def __init__(self, client):
+        self.cache = FakeBackend(client)
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, timeout=None):
+        pass
+
+    def delete(self, key):
+        pass
+
+
+class TestClearPattern:
+    """Tests for CacheHelper.clear_pattern."""
+
+    def test_clear_pattern_removes_only_matching_keys(self):
+        """Test that only keys matching the prefixed pattern are removed."""
+        keys = [f'chess_hall_tables:{i}' for i in range(100000)]
+        keys += ['chess_dashboard:1', 'other_hall_tables:1']
+        client = FakeRedis(keys)
+        helper = CacheHelper(FakeCache(client))
+
+        removed = helper.clear_pattern('hall_tables:*')
+
+        assert removed == 100000
+        assert set(client.store) == {'chess_dashboard:1', 'other_hall_tables:1'}
+
+    def test_clear_pattern_deletes_in_bounded_batches(self):
+        """Test that keys are removed in batches no larger than batch_size."""
+        client = FakeRedis([f'chess_stats:{i}' for i in range(1234)])
+        helper = CacheHelper(FakeCache(client))
+
+        helper.clear_pattern('stats:*', batch_size=500)
+
+        assert client.batch_sizes == [500, 500, 234]
+
+    def test_clear_pattern_falls_back_to_delete(self):
+        """Test DEL fallback on servers without UNLINK."""
+        client = FakeRedis(['chess_halls:1', 'chess_halls:2'], supports_unlink=False)
+        helper = CacheHelper(FakeCache(client))
+
+        assert helper.clear_pattern('halls:*') == 2
+        assert not client.store
+
+    def test_clear_pattern_disabled_cache(self):
+        """Test that a disabled cache is a no-op."""
+        assert CacheHelper(None).clear_pattern('*') == 0
+
+
+class TestCacheHelperOperations:
+    """Tests for CacheHelper get/set/delete binding."""
+
+    def test_disabled_operations_are_noops(self):
+        """Test that a disabled helper returns None and ignores writes."""
+        helper = CacheHelper(None)
+        helper.set('key', 'value', timeout=10)
+        assert helper.get('key') is None
+        assert helper.delete('key') is None
+
+    def test_disabled_decorators_return_function_unchanged(self):
+        """Test that cached/memoize leave functions untouched when disabled."""
+        helper = CacheHelper(None)
+
+        def view():
+            return 'ok'
+
+        assert helper.cached(timeout=30)(view) is view
+        assert helper.memoize(timeout=30)(view) is view
+
+    def test_enabled_operations_delegate_to_cache(self):
+        """Test that an enabled helper reads and writes through the cache."""
+        class DictCache:
+            def __init__(self):
+                self.data = {}
+
+            def get(self, key):
+                return self.data.get(key)
+
+            def set(self, key, value, timeout=None):
+                self.data[key] = value
+
+            def delete(self, key):
+                self.data.pop(key, None)
+
+        helper = CacheHelper(DictCache())
+        helper.set('key', 'value', timeout=10)
+        assert helper.get('key') == 'value'
+        helper.delete('key')
+        assert helper.get('key') is None
@@ -13,10 +13,17 @@ import sys
 import time
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from decimal import Decimal
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, pooling
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 
 class DecimalEncoder(json.JSONEncoder):
@@ -26,6 +33,20 @@ class DecimalEncoder(json.JSONEncoder):
             return float(obj)
         return super().default(obj)
 
+
+def _orjson_default(obj):
+    """Serialize types orjson doesn't know natively."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps_json(obj):
+    """Serialize a stat payload to a JSON string, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(obj, cls=DecimalEncoder)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -47,10 +68,50 @@ DB_CONFIG = {
 
 # Worker settings
 COMPUTE_INTERVAL = int(os.getenv('COMPUTE_INTERVAL', 300))  # 5 minutes default
+FULL_REFRESH_INTERVAL = int(os.getenv('FULL_REFRESH_INTERVAL', 3600))  # recompute at least hourly
+
+# Tables the stats are computed from, plus the parents whose cascading
+# deletes and renames reach them
+STATS_SOURCE_TABLES = (
+    'users', 'players', 'coaches', 'arbiters', 'teams',
+    'halls', 'match_tables', 'matches', 'match_assignments',
+)
+
+# One pooled connection per concurrent compute task, plus one for the schema
+# check and the final write
+POOL_SIZE = 6
+
+# Connection pool, created on first use and kept for the life of the worker
+_db_pool = None
+
+# Secret Manager password, fetched once per process
+_db_password = None
+
+# Set once every key and index from code/migrate_worker_stats.sql is present
+_schema_ready = False
+
+# Whether system_stats has the unique stat_name key flush_stats upserts on
+_stat_name_unique = False
+
+# Whether matches has the indexed match_month column compute_match_statistics groups on
+_match_month_ready = False
+
+# Source-table watermark of the last successful cycle, and when (monotonic) its
+# full recomputation ran
+_last_fingerprint = None
+_last_full_refresh = 0.0
 
 
 def get_db_password():
-    """Get DB password from Secret Manager if running on GCP."""
+    """Get DB password from Secret Manager if running on GCP.
+
+    A fetched secret is cached for the life of the process; a failed fetch is
+    retried on the next call rather than pinning the environment fallback.
+    """
+    global _db_password
+    if _db_password is not None:
+        return _db_password
+
     gcp_project = os.getenv('GCP_PROJECT')
     if gcp_project:
         try:
@@ -58,205 +119,333 @@ def get_db_password():
             client = secretmanager.SecretManagerServiceClient()
             name = f"projects/{gcp_project}/secrets/chess-tournament-db-password/versions/latest"
             response = client.access_secret_version(request={"name": name})
-            return response.payload.data.decode('UTF-8')
+            _db_password = response.payload.data.decode('UTF-8')
+            return _db_password
         except Exception as e:
             logger.warning(f"Could not fetch secret from Secret Manager: {e}")
     return os.getenv('DB_PASSWORD', '1234')
 
 
 def get_db_connection():
-    """Create database connection."""
+    """Get a pooled database connection, creating the pool on first use."""
+    global _db_pool
     try:
-        config = DB_CONFIG.copy()
-        config['password'] = get_db_password()
-        connection = mysql.connector.connect(**config)
+        if _db_pool is None:
+            config = DB_CONFIG.copy()
+            config['password'] = get_db_password()
+            _db_pool = pooling.MySQLConnectionPool(
+                pool_name='chess',
+                pool_size=POOL_SIZE,
+                **config
+            )
+        connection = _db_pool.get_connection()
+        # The connection sits idle between cycles; revive it if the server dropped it
+        connection.ping(reconnect=True, attempts=3)
         return connection
     except Error as e:
         logger.error(f"Error connecting to MySQL: {e}")
         return None
 
 
-def save_stat(cursor, conn, stat_name, stat_value, category='general'):
-    """Save a statistic to the system_stats table."""
-    try:
-        # Delete old stat with same name
-        cursor.execute(
-            "DELETE FROM system_stats WHERE stat_name = %s",
-            (stat_name,)
+# Indexes the worker's GROUP BY queries scan in order, as (table, index);
+# added by code/migrate_worker_stats.sql
+GROUPING_INDEXES = (
+    ('matches', 'idx_matches_month'),
+    ('players', 'idx_players_nat_elo'),
+)
+
+
+def ensure_schema(cursor):
+    """Check for the keys and indexes the worker's queries rely on.
+
+    The worker doesn't alter the schema itself: anything missing is logged
+    with a pointer to code/migrate_worker_stats.sql, and the queries fall
+    back to forms that work without it. Re-checked each cycle until present.
+    """
+    global _schema_ready, _stat_name_unique, _match_month_ready
+    if _schema_ready:
+        return
+
+    missing = []
+    for table, index in GROUPING_INDEXES:
+        cursor.execute("""
+            SELECT COUNT(*) as count
+            FROM information_schema.statistics
+            WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+        """, (table, index))
+        if not cursor.fetchone()['count']:
+            missing.append(f"{table}.{index}")
+    _match_month_ready = 'matches.idx_matches_month' not in missing
+    if missing:
+        logger.error(
+            f"Missing {', '.join(missing)}; apply code/migrate_worker_stats.sql. "
+            "Grouping without these indexes until then"
         )
-        # Insert new stat
-        cursor.execute(
-            """INSERT INTO system_stats (stat_name, stat_value, stat_category)
-               VALUES (%s, %s, %s)""",
-            (stat_name, json.dumps(stat_value, cls=DecimalEncoder) if isinstance(stat_value, (dict, list)) else str(stat_value), category)
+
+    cursor.execute("""
+        SELECT COUNT(*) as count
+        FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = 'system_stats'
+          AND column_name = 'stat_name' AND non_unique = 0
+    """)
+    _stat_name_unique = bool(cursor.fetchone()['count'])
+    if not _stat_name_unique:
+        logger.error(
+            "system_stats has no unique key on stat_name; apply "
+            "code/migrate_worker_stats.sql. Replacing stats with DELETE + INSERT until then"
         )
+    _schema_ready = _stat_name_unique and not missing
+
+
+def read_data_fingerprint(cursor):
+    """Return the source tables' last-modified times, or None if they can't be trusted.
+
+    InnoDB tracks UPDATE_TIME on commit, including cascaded changes, with
+    one-second resolution; a write in the current second may not show yet.
+    """
+    try:
+        # MySQL 8 caches information_schema table stats for a day by default
+        cursor.execute("SET SESSION information_schema_stats_expiry = 0")
+    except Error:
+        pass  # MySQL 5.7 has no cache to bypass
+
+    placeholders = ', '.join(['%s'] * len(STATS_SOURCE_TABLES))
+    cursor.execute(f"""
+        SELECT table_name as table_name, update_time as update_time,
+               NOW() as checked_at
+        FROM information_schema.tables
+        WHERE table_schema = DATABASE() AND table_name IN ({placeholders})
+        ORDER BY table_name
+    """, STATS_SOURCE_TABLES)
+    rows = cursor.fetchall()
+    if not rows:
+        return None
+
+    changed = [r['update_time'] for r in rows if r['update_time']]
+    if changed and max(changed) >= rows[0]['checked_at'] - timedelta(seconds=1):
+        return None
+    return tuple((r['table_name'], r['update_time']) for r in rows)
+
+
+def save_stat(pending_stats, stat_name, stat_value, category='general'):
+    """Queue a statistic for the next write to the system_stats table."""
+    pending_stats.append((
+        stat_name,
+        dumps_json(stat_value) if isinstance(stat_value, (dict, list)) else str(stat_value),
+        category
+    ))
+    logger.debug(f"Computed stat: {stat_name} = {stat_value}")
+
+
+def flush_stats(cursor, conn, pending_stats):
+    """Write all queued statistics in one batch and commit, replacing previous values."""
+    try:
+        if _stat_name_unique:
+            cursor.executemany(
+                """INSERT INTO system_stats (stat_name, stat_value, stat_category)
+                   VALUES (%s, %s, %s)
+                   ON DUPLICATE KEY UPDATE stat_value = VALUES(stat_value),
+                                           stat_category = VALUES(stat_category),
+                                           computed_at = CURRENT_TIMESTAMP""",
+                pending_stats
+            )
+        else:
+            # No key to upsert on: replace the rows by name in the same transaction
+            names = [stat[0] for stat in pending_stats]
+            cursor.execute(
+                f"DELETE FROM system_stats WHERE stat_name IN ({', '.join(['%s'] * len(names))})",
+                names
+            )
+            cursor.executemany(
+                """INSERT INTO system_stats (stat_name, stat_value, stat_category)
+                   VALUES (%s, %s, %s)""",
+                pending_stats
+            )
         conn.commit()
-        logger.debug(f"Saved stat: {stat_name} = {stat_value}")
+        logger.debug(f"Saved {len(pending_stats)} stats")
+        pending_stats.clear()
+        return True
     except Error as e:
-        logger.error(f"Error saving stat {stat_name}: {e}")
+        logger.error(f"Error saving stats: {e}")
         conn.rollback()
+        return False
+
+
+def execute_batch(cursor, *statements):
+    """Send several SELECTs to the server in one multi-statement round trip.
+
+    Returns an iterator over the statements' results, in order; each result
+    must be read in full before advancing to the next.
+    """
+    return cursor.execute(';'.join(statements), multi=True)
 
 
-def compute_team_statistics(cursor, conn):
+def compute_team_statistics(cursor, pending_stats):
     """Compute team-level statistics."""
     logger.info("Computing team statistics...")
 
-    # Total matches per team
+    # Match counts and win rates in one pass over teams/matches/assignments.
+    # Each side of the UNION ALL can use its own team index, where an OR
+    # join would scan matches once per team; team1 plays white, team2 black.
+    # A team never plays itself, so (team_id, match_id) pairs are already
+    # unique and need no DISTINCT
     cursor.execute("""
         SELECT t.team_id, t.team_name,
-               COUNT(DISTINCT m.match_id) as total_matches
+               COUNT(g.match_id) as total_matches,
+               COALESCE(SUM(g.won), 0) as wins,
+               COUNT(g.assignment_id) as total_games,
+               ROUND(COALESCE(SUM(g.won), 0) / GREATEST(COUNT(g.assignment_id), 1) * 100, 2)
+                   as win_rate
         FROM teams t
-        LEFT JOIN matches m ON t.team_id = m.team1_id OR t.team_id = m.team2_id
+        LEFT JOIN (
+            SELECT m.team1_id as team_id, m.match_id,
+                   ma.match_id as assignment_id,
+                   CASE WHEN ma.result = 'white wins' THEN 1 ELSE 0 END as won
+            FROM matches m
+            LEFT JOIN match_assignments ma ON m.match_id = ma.match_id
+            UNION ALL
+            SELECT m.team2_id, m.match_id, ma.match_id,
+                   CASE WHEN ma.result = 'black wins' THEN 1 ELSE 0 END
+            FROM matches m
+            LEFT JOIN match_assignments ma ON m.match_id = ma.match_id
+        ) g ON g.team_id = t.team_id
         GROUP BY t.team_id, t.team_name
         ORDER BY total_matches DESC
     """)
-    matches_per_team = cursor.fetchall()
-    save_stat(cursor, conn, 'matches_per_team', [
-        {'team_id': r['team_id'], 'team_name': r['team_name'], 'matches': r['total_matches']}
-        for r in matches_per_team
-    ], 'teams')
-
-    # Team win rates
-    cursor.execute("""
-        SELECT t.team_id, t.team_name,
-               SUM(CASE
-                   WHEN (m.team1_id = t.team_id AND ma.result = 'white wins')
-                     OR (m.team2_id = t.team_id AND ma.result = 'black wins')
-                   THEN 1 ELSE 0
-               END) as wins,
-               COUNT(ma.match_id) as total_games
-        FROM teams t
-        LEFT JOIN matches m ON t.team_id = m.team1_id OR t.team_id = m.team2_id
-        LEFT JOIN match_assignments ma ON m.match_id = ma.match_id
-        GROUP BY t.team_id, t.team_name
-    """)
-    team_win_rates = cursor.fetchall()
-    save_stat(cursor, conn, 'team_win_rates', [
-        {
-            'team_id': r['team_id'],
-            'team_name': r['team_name'],
-            'wins': r['wins'] or 0,
-            'total_games': r['total_games'] or 0,
-            'win_rate': round((r['wins'] or 0) / max(r['total_games'] or 1, 1) * 100, 2)
-        }
-        for r in team_win_rates
-    ], 'teams')
-
-
-def compute_player_statistics(cursor, conn):
+    # Stream the unbuffered rows straight into both payloads
+    matches_per_team, team_win_rates = [], []
+    for team_id, team_name, total_matches, wins, total_games, win_rate in cursor:
+        matches_per_team.append(
+            {'team_id': team_id, 'team_name': team_name, 'matches': total_matches}
+        )
+        team_win_rates.append({
+            'team_id': team_id,
+            'team_name': team_name,
+            'wins': wins,
+            'total_games': total_games,
+            'win_rate': win_rate
+        })
+    save_stat(pending_stats, 'matches_per_team', matches_per_team, 'teams')
+    save_stat(pending_stats, 'team_win_rates', team_win_rates, 'teams')
+
+
+def compute_player_statistics(cursor, pending_stats):
     """Compute player-level statistics."""
     logger.info("Computing player statistics...")
 
-    # Top players by ELO
-    cursor.execute("""
+    results = execute_batch(cursor, """
         SELECT username, name, surname, elorating, nationality
         FROM players
         ORDER BY elorating DESC
         LIMIT 10
+    """, """
+        SELECT p.username, p.name, p.surname,
+               COALESCE(pm.total_matches, 0) as total_matches
+        FROM players p
+        LEFT JOIN (
+            SELECT username, COUNT(*) as total_matches
+            FROM (
+                SELECT white_player as username FROM match_assignments
+                UNION ALL
+                SELECT black_player FROM match_assignments
+            ) sides
+            GROUP BY username
+        ) pm ON pm.username = p.username
+        ORDER BY total_matches DESC
+        LIMIT 10
+    """, """
+        SELECT nationality, ROUND(AVG(elorating)) as avg_elo, COUNT(*) as player_count
+        FROM players
+        GROUP BY nationality
+        HAVING player_count >= 2
+        ORDER BY AVG(elorating) DESC
     """)
-    top_players = cursor.fetchall()
-    save_stat(cursor, conn, 'top_players_by_elo', [
+
+    # Top players by ELO
+    save_stat(pending_stats, 'top_players_by_elo', [
         {
-            'username': r['username'],
-            'name': f"{r['name']} {r['surname']}",
-            'elo': r['elorating'],
-            'nationality': r['nationality']
+            'username': username,
+            'name': f"{name} {surname}",
+            'elo': elorating,
+            'nationality': nationality
         }
-        for r in top_players
+        for username, name, surname, elorating, nationality in next(results)
     ], 'players')
 
     # Most active players
-    cursor.execute("""
-        SELECT p.username, p.name, p.surname,
-               COUNT(ma.match_id) as total_matches
-        FROM players p
-        LEFT JOIN match_assignments ma ON p.username = ma.white_player OR p.username = ma.black_player
-        GROUP BY p.username, p.name, p.surname
-        ORDER BY total_matches DESC
-        LIMIT 10
-    """)
-    active_players = cursor.fetchall()
-    save_stat(cursor, conn, 'most_active_players', [
+    save_stat(pending_stats, 'most_active_players', [
         {
-            'username': r['username'],
-            'name': f"{r['name']} {r['surname']}",
-            'matches': r['total_matches'] or 0
+            'username': username,
+            'name': f"{name} {surname}",
+            'matches': total_matches or 0
         }
-        for r in active_players
+        for username, name, surname, total_matches in next(results)
     ], 'players')
 
     # Average ELO by nationality
-    cursor.execute("""
-        SELECT nationality, AVG(elorating) as avg_elo, COUNT(*) as player_count
-        FROM players
-        GROUP BY nationality
-        HAVING player_count >= 2
-        ORDER BY avg_elo DESC
-    """)
-    elo_by_nationality = cursor.fetchall()
-    save_stat(cursor, conn, 'avg_elo_by_nationality', [
+    save_stat(pending_stats, 'avg_elo_by_nationality', [
         {
-            'nationality': r['nationality'],
-            'avg_elo': round(r['avg_elo'], 0),
-            'player_count': r['player_count']
+            'nationality': nationality,
+            'avg_elo': avg_elo,
+            'player_count': player_count
         }
-        for r in elo_by_nationality
+        for nationality, avg_elo, player_count in next(results)
     ], 'players')
 
 
-def compute_match_statistics(cursor, conn):
+def compute_match_statistics(cursor, pending_stats):
     """Compute match-level statistics."""
     logger.info("Computing match statistics...")
 
-    # Total matches
-    cursor.execute("SELECT COUNT(*) as total FROM matches")
-    total_matches = cursor.fetchone()['total']
-    save_stat(cursor, conn, 'total_matches', total_matches, 'matches')
-
-    # Matches by result
-    cursor.execute("""
+    # Matches per month are read backwards off idx_matches_month (YYYYMM);
+    # before the migration, the same value is computed per row
+    match_month = 'match_month' if _match_month_ready else 'YEAR(date) * 100 + MONTH(date)'
+    results = execute_batch(cursor, """
+        SELECT COUNT(*) as total FROM matches
+    """, """
         SELECT result, COUNT(*) as count
         FROM match_assignments
         GROUP BY result
-    """)
-    results = cursor.fetchall()
-    save_stat(cursor, conn, 'matches_by_result', {
-        r['result']: r['count'] for r in results
-    }, 'matches')
-
-    # Matches per month
-    cursor.execute("""
-        SELECT DATE_FORMAT(date, '%Y-%m') as month, COUNT(*) as count
+    """, f"""
+        SELECT {match_month} as match_month, COUNT(*) as count
         FROM matches
-        GROUP BY month
-        ORDER BY month DESC
+        GROUP BY match_month
+        ORDER BY match_month DESC
         LIMIT 12
-    """)
-    monthly = cursor.fetchall()
-    save_stat(cursor, conn, 'matches_per_month', [
-        {'month': r['month'], 'count': r['count']}
-        for r in monthly
-    ], 'matches')
-
-    # Average rating by arbiter
-    cursor.execute("""
+    """, """
         SELECT arbiter_username, AVG(ratings) as avg_rating, COUNT(*) as rated_count
         FROM matches
         WHERE ratings IS NOT NULL
         GROUP BY arbiter_username
     """)
-    arbiter_ratings = cursor.fetchall()
-    save_stat(cursor, conn, 'arbiter_avg_ratings', [
+
+    # Total matches
+    (total_matches,), = next(results).fetchall()
+    save_stat(pending_stats, 'total_matches', total_matches, 'matches')
+
+    # Matches by result
+    save_stat(pending_stats, 'matches_by_result', {
+        result: count for result, count in next(results)
+    }, 'matches')
+
+    # Matches per month
+    save_stat(pending_stats, 'matches_per_month', [
+        {'month': f"{match_month // 100:04d}-{match_month % 100:02d}", 'count': count}
+        for match_month, count in next(results)
+    ], 'matches')
+
+    # Average rating by arbiter
+    save_stat(pending_stats, 'arbiter_avg_ratings', [
         {
-            'arbiter': r['arbiter_username'],
-            'avg_rating': round(r['avg_rating'], 2) if r['avg_rating'] else 0,
-            'rated_count': r['rated_count']
+            'arbiter': arbiter_username,
+            'avg_rating': round(avg_rating, 2) if avg_rating else 0,
+            'rated_count': rated_count
         }
-        for r in arbiter_ratings
+        for arbiter_username, avg_rating, rated_count in next(results)
     ], 'arbiters')
 
 
-def compute_hall_statistics(cursor, conn):
+def compute_hall_statistics(cursor, pending_stats):
     """Compute hall utilization statistics."""
     logger.info("Computing hall statistics...")
 
@@ -269,55 +458,87 @@ def compute_hall_statistics(cursor, conn):
         GROUP BY h.hall_id, h.hall_name, h.hall_country, h.hall_capacity
         ORDER BY match_count DESC
     """)
-    hall_usage = cursor.fetchall()
-    save_stat(cursor, conn, 'hall_utilization', [
+    save_stat(pending_stats, 'hall_utilization', [
         {
-            'hall_id': r['hall_id'],
-            'hall_name': r['hall_name'],
-            'country': r['hall_country'],
-            'capacity': r['hall_capacity'],
-            'matches_hosted': r['match_count'] or 0
+            'hall_id': hall_id,
+            'hall_name': hall_name,
+            'country': hall_country,
+            'capacity': hall_capacity,
+            'matches_hosted': match_count or 0
         }
-        for r in hall_usage
+        for hall_id, hall_name, hall_country, hall_capacity, match_count in cursor
     ], 'halls')
 
 
-def compute_summary_statistics(cursor, conn):
-    """Compute overall summary statistics."""
-    logger.info("Computing summary statistics...")
+# Summary keys, in the order compute_summary_statistics selects them
+SUMMARY_COUNTS = (
+    'total_users', 'total_players', 'total_coaches', 'total_arbiters',
+    'total_teams', 'total_matches', 'total_halls',
+)
 
-    stats = {}
 
-    cursor.execute("SELECT COUNT(*) as count FROM users")
-    stats['total_users'] = cursor.fetchone()['count']
+def compute_summary_statistics(cursor, pending_stats):
+    """Compute overall summary statistics."""
+    logger.info("Computing summary statistics...")
 
-    cursor.execute("SELECT COUNT(*) as count FROM players")
-    stats['total_players'] = cursor.fetchone()['count']
+    # All counts and the average in one round trip
+    cursor.execute("""
+        SELECT (SELECT COUNT(*) FROM users) as total_users,
+               (SELECT COUNT(*) FROM players) as total_players,
+               (SELECT COUNT(*) FROM coaches) as total_coaches,
+               (SELECT COUNT(*) FROM arbiters) as total_arbiters,
+               (SELECT COUNT(*) FROM teams) as total_teams,
+               (SELECT COUNT(*) FROM matches) as total_matches,
+               (SELECT COUNT(*) FROM halls) as total_halls,
+               (SELECT AVG(elorating) FROM players) as avg_elo
+    """)
+    *counts, avg_elo = cursor.fetchone()
+    stats = dict(zip(SUMMARY_COUNTS, counts))
+    stats['average_player_elo'] = round(avg_elo, 0) if avg_elo else 0
 
-    cursor.execute("SELECT COUNT(*) as count FROM coaches")
-    stats['total_coaches'] = cursor.fetchone()['count']
+    save_stat(pending_stats, 'summary', stats, 'summary')
 
-    cursor.execute("SELECT COUNT(*) as count FROM arbiters")
-    stats['total_arbiters'] = cursor.fetchone()['count']
 
-    cursor.execute("SELECT COUNT(*) as count FROM teams")
-    stats['total_teams'] = cursor.fetchone()['count']
+# Independent read phases, run concurrently; their stats are written in this order
+COMPUTE_TASKS = (
+    compute_summary_statistics,
+    compute_team_statistics,
+    compute_player_statistics,
+    compute_match_statistics,
+    compute_hall_statistics,
+)
 
-    cursor.execute("SELECT COUNT(*) as count FROM matches")
-    stats['total_matches'] = cursor.fetchone()['count']
 
-    cursor.execute("SELECT COUNT(*) as count FROM halls")
-    stats['total_halls'] = cursor.fetchone()['count']
+def run_compute_task(compute):
+    """Run one compute_* function on its own pooled connection; returns its stats.
 
-    cursor.execute("SELECT AVG(elorating) as avg FROM players")
-    result = cursor.fetchone()
-    stats['average_player_elo'] = round(result['avg'], 0) if result['avg'] else 0
+    The compute functions unpack plain tuple rows, which skip the dictionary
+    cursor's per-row dict construction.
+    """
+    conn = get_db_connection()
+    if not conn:
+        raise Error(msg=f"Failed to connect to database for {compute.__name__}")
 
-    save_stat(cursor, conn, 'summary', stats, 'summary')
+    try:
+        # A read-only transaction needs no transaction id, and READ COMMITTED
+        # gives each statement a fresh view instead of holding one snapshot
+        # (and its undo history) open across the phase's queries
+        conn.start_transaction(readonly=True, isolation_level='READ COMMITTED')
+        cursor = conn.cursor()
+        try:
+            task_stats = []
+            compute(cursor, task_stats)
+            return task_stats
+        finally:
+            cursor.close()
+            conn.rollback()
+    finally:
+        conn.close()
 
 
 def run_computations():
-    """Run all statistical computations."""
+    """Run all statistical computations, unless no source table changed since the last cycle."""
+    global _last_fingerprint, _last_full_refresh
     conn = get_db_connection()
     if not conn:
         logger.error("Failed to connect to database")
@@ -325,16 +546,37 @@ def run_computations():
 
     try:
         cursor = conn.cursor(dictionary=True)
-
-        compute_summary_statistics(cursor, conn)
-        compute_team_statistics(cursor, conn)
-        compute_player_statistics(cursor, conn)
-        compute_match_statistics(cursor, conn)
-        compute_hall_statistics(cursor, conn)
+        ensure_schema(cursor)
+
+        # Taken before the reads, so writes made during this cycle mark the next one dirty
+        fingerprint = read_data_fingerprint(cursor)
+        if (fingerprint is not None and fingerprint == _last_fingerprint
+                and time.monotonic() - _last_full_refresh < FULL_REFRESH_INTERVAL):
+            # last_computed_at stays at the last full run; record that the data was still current
+            logger.info("No source tables changed since the last cycle; skipping")
+            pending_stats = []
+            save_stat(pending_stats, 'last_checked_at', datetime.now().isoformat(), 'meta')
+            return flush_stats(cursor, conn, pending_stats)
+
+        pending_stats = []
+
+        # Overlap the reads' round trips; results are collected in task order
+        with ThreadPoolExecutor(max_workers=len(COMPUTE_TASKS)) as executor:
+            futures = [executor.submit(run_compute_task, compute) for compute in COMPUTE_TASKS]
+            for future in futures:
+                pending_stats.extend(future.result())
 
         # Save last computation time
-        save_stat(cursor, conn, 'last_computed_at', datetime.now().isoformat(), 'meta')
+        now = datetime.now().isoformat()
+        save_stat(pending_stats, 'last_computed_at', now, 'meta')
+        save_stat(pending_stats, 'last_checked_at', now, 'meta')
+
+        # One batched write and one commit for the whole cycle
+        if not flush_stats(cursor, conn, pending_stats):
+            return False
 
+        _last_fingerprint = fingerprint
+        _last_full_refresh = time.monotonic()
         logger.info("All computations completed successfully")
         return True
 
@@ -353,16 +595,23 @@ def main():
     logger.info(f"Compute interval: {COMPUTE_INTERVAL} seconds")
     logger.info(f"Database host: {DB_CONFIG['host']}")
 
+    # Cycles start on a fixed monotonic schedule, so their durations don't drift it
+    next_run = time.monotonic()
     while True:
         try:
-            start_time = time.time()
+            start_time = time.monotonic()
             success = run_computations()
 
-            elapsed = time.time() - start_time
+            elapsed = time.monotonic() - start_time
             logger.info(f"Computation {'succeeded' if success else 'failed'} in {elapsed:.2f}s")
 
-            # Sleep until next interval
-            sleep_time = max(COMPUTE_INTERVAL - elapsed, 10)
+            # Sleep until the next slot; an overrun starts the next cycle
+            # straight away and drops the slots it missed
+            next_run += COMPUTE_INTERVAL
+            now = time.monotonic()
+            if next_run < now:
+                next_run = now
+            sleep_time = next_run - now
             logger.info(f"Sleeping for {sleep_time:.0f} seconds...")
             time.sleep(sleep_time)
 
@@ -372,6 +621,7 @@ def main():
         except Exception as e:
             logger.error(f"Unexpected error: {e}")
             time.sleep(60)  # Wait before retrying
+            next_run = time.monotonic()
 
 
 if __name__ == '__main__':